@@ -0,0 +1,172 @@
+"""
+Play many seeded games headless, spread across every core.
+
+    python batch.py --size 30 16 --percent 20 --games 1000
+
+Games are split into chunks of seeds. Each worker process plays a whole chunk
+for a single direction and hyper setting, and sends the results back as one
+list of plain tuples, which keeps traffic between processes small. Every
+worker keeps one Engine, reset in place for each game.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from benchmark import DIRECTIONS
+from engine import Engine
+from game_settings import Setting
+from results import ResultsStore
+
+
+RESULT_FIELDS = ("direction", "hyper", "seed", "total_mines", "cells_cleared", "safes_left",
+                 "win", "game_over", "time", "board")
+
+
+# The worker's Engine, reused for every game it plays. Built by _init_worker().
+_engine = None
+
+
+def _init_worker(width, height):
+    """Builds the Engine once per worker, along with its NeighborTable, to play every game on."""
+    global _engine
+    _engine = Engine(width, height, 0,
+                     hyper_solving=Setting(True),
+                     frontier_solving=Setting(True),
+                     guessing=Setting(False),
+                     direction=Setting("LIFO"))
+
+
+def play_chunk(width, height, percent_mined, direction, hyper, seeds, frontier=True, guessing=False):
+    """
+    Play one game per seed in `seeds`, on the worker's Engine.
+
+    Returns: `list` of `tuple`s, in the order of RESULT_FIELDS.
+    """
+    if _engine is None:
+        _init_worker(width, height)
+    engine = _engine
+    # The queues hold on to the direction Setting, so each Setting is changed in place.
+    engine.hyper_solving.set(hyper)
+    engine.frontier_solving.set(frontier)
+    engine.guessing.set(guessing)
+    engine.direction.set(direction)
+
+    results = []
+    for seed in seeds:
+        start = time.perf_counter()
+        engine.reset(width, height, percent_mined, seed)
+        engine.left_click((width // 2, height // 2))
+        elapsed = time.perf_counter() - start
+        field = engine.field
+        results.append((direction, hyper, seed, field.total_mines, field.num_naked_safe, engine.safes_left,
+                        engine.win, engine.game_over, elapsed, field.encode()))
+    return results
+
+
+def run_batch(width, height, percent_mined, games, directions=DIRECTIONS, hyper=(True, False),
+              frontier=True, guessing=False, workers=None, chunk_size=50):
+    """
+    Play `games` seeded games for every combination of `directions` and `hyper`.
+
+    The same seeds, 0 to `games` - 1, are used for every combination,
+    so they all play the same boards.
+
+    Args:
+        width, height: Dimensions of the board.
+        percent_mined: Percent of cells to be mined.
+        games: Number of games per combination.
+        directions: Solving directions to play.
+        hyper: Hyper Solve settings to play.
+        frontier, guessing: Frontier Solve and guessing settings.
+        workers: Number of processes. Defaults to one per core.
+        chunk_size: Number of games sent to a worker at a time.
+
+    Returns: `list` of `dict`s, one per game, ready for `ResultsStore.add()`.
+    """
+    settings = {"width": width, "height": height, "percent_mined": percent_mined,
+                "frontier": frontier, "guessing": guessing}
+
+    chunks = [(direction, hyper_solving, range(start, min(start + chunk_size, games)))
+              for direction in directions
+              for hyper_solving in hyper
+              for start in range(0, games, chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(width, height)) as executor:
+        futures = [executor.submit(play_chunk, width, height, percent_mined, direction, hyper_solving,
+                                   seeds, frontier, guessing)
+                   for direction, hyper_solving, seeds in chunks]
+        for future in futures:
+            results.extend(dict(zip(RESULT_FIELDS, result), **settings) for result in future.result())
+    return results
+
+
+def summarize(results):
+    """
+    Win rate and average cells cleared for each direction and hyper setting.
+
+    Returns: `list` of `dict`s, one per combination.
+    """
+    groups = {}
+    for result in results:
+        groups.setdefault((result["direction"], result["hyper"]), []).append(result)
+
+    summary = []
+    for (direction, hyper), group in groups.items():
+        summary.append({
+            "direction": direction,
+            "hyper": hyper,
+            "games": len(group),
+            "win_rate": sum(result["win"] for result in group) / len(group),
+            "loss_rate": sum(result["game_over"] for result in group) / len(group),
+            "mean_cells_cleared": sum(result["cells_cleared"] for result in group) / len(group),
+            "mean_time": sum(result["time"] for result in group) / len(group),
+        })
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play many seeded games across every core.")
+    parser.add_argument("--size", nargs=2, type=int, default=(30, 16), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--percent", type=int, default=20, help="percent of cells mined")
+    parser.add_argument("--games", type=int, default=100, help="games per direction and hyper setting")
+    parser.add_argument("--directions", nargs="+", choices=DIRECTIONS, default=list(DIRECTIONS))
+    parser.add_argument("--hyper", choices=("on", "off", "both"), default="both")
+    parser.add_argument("--no-frontier", action="store_true")
+    parser.add_argument("--guessing", action="store_true")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--output", help="write every game's result here as JSON")
+    parser.add_argument("--db", help="add every game's result to this SQLite results store")
+    args = parser.parse_args(argv)
+
+    hyper = {"on": (True,), "off": (False,), "both": (True, False)}[args.hyper]
+    width, height = args.size
+
+    start = time.perf_counter()
+    results = run_batch(width, height, args.percent, args.games,
+                        directions=args.directions, hyper=hyper,
+                        frontier=not args.no_frontier, guessing=args.guessing,
+                        workers=args.workers, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    if args.output:
+        games = [{key: value for key, value in result.items() if key != "board"} for result in results]
+        with open(args.output, "w") as file:
+            json.dump({"summary": summary, "games": games}, file, indent=2)
+    if args.db:
+        with ResultsStore(args.db) as store:
+            store.add(results)
+
+    for row in summary:
+        print("{direction:>8}  hyper {hyper!s:<5}  win {win_rate:6.1%}  loss {loss_rate:6.1%}  "
+              "cleared {mean_cells_cleared:8.1f}  {mean_time:.4f}s/game".format(**row))
+    print("{} games in {:.1f}s with {} workers".format(len(results), elapsed, args.workers))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Headless solver benchmarks.
+
+Plays a seeded matrix of board sizes, mine densities and solving directions
+without a display, and reports timings and counters as JSON.
+
+    python benchmark.py --sizes beginner expert --output baseline.json
+    python benchmark.py --sizes beginner expert --compare baseline.json
+
+Every size but "huge" is played by default. A 1000 x 1000 board takes far
+too long to play across the whole matrix, so ask for it by name.
+
+With `--compare`, every case is checked against the same case in a stored
+baseline. A case regresses if it is slower than the baseline by more than
+`--tolerance`, if it no longer ends the same way, or if the baseline has no
+such case to compare against. Exits with status 1 if anything regressed.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from engine import Engine
+from game_settings import Setting
+
+
+SIZES = {
+    "beginner": (9, 9),
+    "intermediate": (16, 16),
+    "expert": (30, 16),
+    "large": (100, 100),
+    "huge": (1000, 1000),
+}
+
+# Sizes played unless others are asked for. "huge" is opt-in.
+DEFAULT_SIZES = ("beginner", "intermediate", "expert", "large")
+
+DENSITIES = (10, 15, 20)
+
+DIRECTIONS = ("LIFO", "FIFO", "whiplash", "random", "north", "south", "east", "west")
+
+
+def play(width, height, percent_mined, direction, seed, hyper=True, frontier=True, guessing=False):
+    """
+    Play one game from a first click in the middle of the board, until the solver stops.
+
+    Returns: the finished `Engine`.
+    """
+    engine = Engine(width, height, percent_mined,
+                    hyper_solving=Setting(hyper),
+                    frontier_solving=Setting(frontier),
+                    guessing=Setting(guessing),
+                    direction=Setting(direction),
+                    seed=seed)
+    engine.left_click((width // 2, height // 2))
+    return engine
+
+
+def run_case(size, percent_mined, direction, seed, repeat=1, memory=True, **settings):
+    """
+    Benchmark a single game.
+
+    Args:
+        size: Name of a board size in SIZES.
+        percent_mined: Percent of cells to be mined.
+        direction: Solving direction, as chosen in the direction panel.
+        seed: Seed for mine placement and the "random" direction.
+        repeat: Number of times to play the game. The fastest time is kept.
+        memory: If True, plays once more while tracing memory allocations.
+                Tracing slows the game down, so that run is not timed.
+        settings: Passed on to `play()`.
+
+    Returns: `dict` of results.
+    """
+    width, height = SIZES[size]
+
+    wall_time = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine = play(width, height, percent_mined, direction, seed, **settings)
+        elapsed = time.perf_counter() - start
+        blocks = engine.stats.snapshot()["blocks"]
+        if wall_time is None or elapsed < wall_time:
+            wall_time = elapsed
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        play(width, height, percent_mined, direction, seed, **settings)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    cells_cleared = engine.field.num_naked_safe
+    return {
+        "size": size,
+        "width": width,
+        "height": height,
+        "percent_mined": percent_mined,
+        "direction": direction,
+        "seed": seed,
+        "wall_time": wall_time,
+        "cells_cleared": cells_cleared,
+        "cells_per_second": cells_cleared / wall_time if wall_time else None,
+        "blocks": blocks,
+        "peak_queue_lengths": {
+            "clear_queue": engine.clear_queue.peak_length,
+            "auto_queue": engine.auto_queue.peak_length,
+            "hyper_queue": engine.hyper_queue.peak_length,
+        },
+        "peak_memory": peak_memory,
+        "win": engine.win,
+        "game_over": engine.game_over,
+        "safes_left": engine.safes_left,
+    }
+
+
+def case_key(case):
+    """Identifies the same case across runs."""
+    return case["size"], case["percent_mined"], case["direction"], case["seed"]
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Check `results` against `baseline`.
+
+    Args:
+        results: `list` of case results from `run_case()`.
+        baseline: `list` of case results from an earlier run.
+        tolerance: Fraction by which a case may be slower than its baseline.
+
+    Returns: `list` of regressions, each a `dict` describing the case and what changed.
+             A case missing from the baseline is reported too, since it can't be checked.
+    """
+    baseline = {case_key(case): case for case in baseline}
+    regressions = []
+    for case in results:
+        name = dict(zip(("size", "percent_mined", "direction", "seed"), case_key(case)))
+        before = baseline.get(case_key(case))
+        if before is None:
+            regressions.append({"case": name, "problems": ["missing from baseline"]})
+            continue
+        problems = []
+        if case["wall_time"] > before["wall_time"] * (1 + tolerance):
+            problems.append("wall_time {:.4f}s -> {:.4f}s".format(before["wall_time"], case["wall_time"]))
+        for outcome in ("win", "game_over", "safes_left"):
+            if case[outcome] != before[outcome]:
+                problems.append("{} {} -> {}".format(outcome, before[outcome], case[outcome]))
+        if problems:
+            regressions.append({"case": name, "problems": problems})
+    return regressions
+
+
+def positive_int(text):
+    """Argument type for counts which must be at least 1."""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1: {}".format(text))
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the solver headless.")
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=list(DEFAULT_SIZES),
+                        help="board sizes to play (default: all but huge)")
+    parser.add_argument("--densities", nargs="+", type=int, default=list(DENSITIES))
+    parser.add_argument("--directions", nargs="+", choices=DIRECTIONS, default=list(DIRECTIONS))
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeds per case, starting at 0")
+    parser.add_argument("--repeat", type=positive_int, default=1, help="plays per case, fastest is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the memory tracing run")
+    parser.add_argument("--no-hyper", action="store_true")
+    parser.add_argument("--no-frontier", action="store_true")
+    parser.add_argument("--guessing", action="store_true")
+    parser.add_argument("--output", help="write JSON here instead of to stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="fraction a case may be slower than the baseline (default 0.1)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        for percent_mined in args.densities:
+            for direction in args.directions:
+                for seed in range(args.seeds):
+                    results.append(run_case(size, percent_mined, direction, seed,
+                                            repeat=args.repeat,
+                                            memory=not args.no_memory,
+                                            hyper=not args.no_hyper,
+                                            frontier=not args.no_frontier,
+                                            guessing=args.guessing))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "total_time": sum(case["wall_time"] for case in results),
+        "cases": results,
+    }
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        report["regressions"] = compare(results, baseline["cases"], args.tolerance)
+        if report["regressions"]:
+            status = 1
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,600 @@
+import tkinter
+from cell_widget import CellWidget, appearance
+from game_settings import COLORS, CELL_SIZE, VIEWPORT_SIZE, VIEWPORT_MARGIN, MINIMAP_SIZE, MINIMAP_INTERVAL
+
+
+def mistakes(field):
+    """Locations of the Cells drawn differently once `field` has detonated: every mine and flag."""
+    mined, flagged = field.mined, field.flagged
+    return [field.loc(i) for i in range(len(field)) if mined[i] or flagged[i]]
+
+
+class LabelBoard(tkinter.Frame):
+    """
+    Draws the board with one `CellWidget` per Cell. Inherits from `tkinter.Frame`.
+
+    Simple, but slow to build for large boards. See CanvasBoard.
+
+    Attributes:
+        cells (`dict`): `CellWidget` for each `(x, y)` location.
+
+    Methods:
+        draw(loc, cell, detonated): Draw `cell` at `loc` based on its state.
+
+        paint(loc, bg): Highlight `loc` with background color `bg`.
+
+        bg(loc): Current background color at `loc`.
+
+        follow(loc): Bring `loc` into view. Every Cell is always in view, so does nothing.
+
+        in_view(loc): Whether `loc` is drawn. Always True.
+
+        forget(loc): Drop a change to `loc` out of view. Every Cell is in view, so does nothing.
+
+        detonate(field): Reveal the mines and false flags of `field`, once it has detonated.
+
+        reset(width, height): Start over, covered, keeping every widget that still fits.
+    """
+
+    def __init__(self, master, width, height, on_left_click, on_right_click):
+        super().__init__(master=master)
+        self.cells = {}
+        self._on_left_click = on_left_click
+        self._on_right_click = on_right_click
+        for x in range(width):
+            for y in range(height):
+                self._add_cell((x, y))
+
+    def _add_cell(self, loc):
+        cell = self.cells[loc] = CellWidget(master=self)
+        cell.grid(row=loc[1], column=loc[0])
+        cell.bind("<Button-1>", lambda event: self._on_left_click(loc))
+        cell.bind("<Button-3>", lambda event: self._on_right_click(loc))
+
+    def reset(self, width, height):
+        """
+        Start over with every Cell covered, on a `width` x `height` board.
+
+        Widgets are only created or destroyed where the size changed.
+        """
+        for loc in [loc for loc in self.cells if loc[0] >= width or loc[1] >= height]:
+            self.cells.pop(loc).destroy()
+        for cell in self.cells.values():
+            cell.reset()
+        for x in range(width):
+            for y in range(height):
+                if (x, y) not in self.cells:
+                    self._add_cell((x, y))
+
+    def draw(self, loc, cell, detonated=False):
+        self.cells[loc].draw(cell, detonated=detonated)
+
+    def paint(self, loc, bg):
+        self.cells[loc].paint(bg)
+
+    def bg(self, loc):
+        return self.cells[loc].bg
+
+    def follow(self, loc):
+        pass
+
+    def in_view(self, loc):
+        return True
+
+    def forget(self, loc):
+        pass
+
+    def detonate(self, field):
+        for loc in mistakes(field):
+            self.draw(loc, field[loc], detonated=True)
+
+
+class CanvasBoard(tkinter.Canvas):
+    """
+    Draws the whole board on a single `tkinter.Canvas`.
+
+    Starts out as one covered background with grid lines. Each Cell only gets
+    its own rectangle and text items once it looks any different, so even
+    very large boards open at once. One handler per mouse button maps the
+    pixel coordinates of a click back to `(x, y)`.
+
+    Attributes:
+        columns (`int`), rows (`int`): Dimensions of the board, in Cells.
+
+        cell_size (`int`): Width and height of each Cell, in pixels.
+
+    Methods:
+        draw(loc, cell, detonated): Draw `cell` at `loc` based on its state.
+
+        paint(loc, bg): Highlight `loc` with background color `bg`.
+
+        bg(loc): Current background color at `loc`.
+
+        loc_at(px, py): `(x, y)` of the Cell under window coordinates `(px, py)`.
+
+        follow(loc): Bring `loc` into view. Every Cell is always in view, so does nothing.
+
+        in_view(loc): Whether `loc` is drawn. Always True.
+
+        forget(loc): Drop a change to `loc` out of view. Every Cell is in view, so does nothing.
+
+        detonate(field): Reveal the mines and false flags of `field`, once it has detonated.
+
+        reset(width, height): Start over, covered.
+    """
+
+    def __init__(self, master, width, height, on_left_click, on_right_click, cell_size=CELL_SIZE):
+        super().__init__(master=master, bg=COLORS['covered'], highlightthickness=0)
+        self.cell_size = cell_size
+        self.font = ('TkDefaultFont', max(6, cell_size // 2), 'bold')
+        self.reset(width, height)
+
+        self.bind("<Button-1>", lambda event: self._click(event, on_left_click))
+        self.bind("<Button-3>", lambda event: self._click(event, on_right_click))
+
+    def reset(self, width, height):
+        """Start over with every Cell covered, on a `width` x `height` board."""
+        cell_size = self.cell_size
+        self.columns = width
+        self.rows = height
+        self.delete('all')
+        self.config(width=width * cell_size, height=height * cell_size)
+
+        for x in range(1, width):
+            self.create_line(x * cell_size, 0, x * cell_size, height * cell_size, fill=COLORS[0])
+        for y in range(1, height):
+            self.create_line(0, y * cell_size, width * cell_size, y * cell_size, fill=COLORS[0])
+
+        self._rects = {}
+        self._texts = {}
+        self._bg = {}
+        self._drawn = {}
+
+    def loc_at(self, px, py):
+        """`(x, y)` of the Cell under window coordinates `(px, py)`, or None."""
+        x = int(self.canvasx(px)) // self.cell_size
+        y = int(self.canvasy(py)) // self.cell_size
+        if 0 <= x < self.columns and 0 <= y < self.rows:
+            return x, y
+        return None
+
+    def _click(self, event, callback):
+        loc = self.loc_at(event.x, event.y)
+        if loc is not None:
+            callback(loc)
+
+    def bg(self, loc):
+        return self._bg.get(loc, 'covered')
+
+    def follow(self, loc):
+        pass
+
+    def in_view(self, loc):
+        return True
+
+    def forget(self, loc):
+        pass
+
+    def detonate(self, field):
+        for loc in mistakes(field):
+            self.draw(loc, field[loc], detonated=True)
+
+    def paint(self, loc, bg):
+        if bg not in COLORS or bg == self.bg(loc):
+            return
+        self._bg[loc] = bg
+        rect = self._rects.get(loc)
+        if rect is not None:
+            self.itemconfigure(rect, fill=COLORS[bg])
+            return
+
+        x, y = loc
+        size = self.cell_size
+        rect = self.create_rectangle(x * size + 1, y * size + 1, (x + 1) * size, (y + 1) * size,
+                                     fill=COLORS[bg], width=0)
+        self._rects[loc] = rect
+        text = self._texts.get(loc)
+        if text is not None:
+            self.tag_raise(text, rect)
+
+    def draw(self, loc, cell, detonated=False):
+        text, fg, bg, relief = appearance(cell, detonated)
+        if (text, fg) != self._drawn.get(loc, (' ', None)):
+            self._drawn[loc] = text, fg
+            fill = COLORS[fg] if fg is not None else ''
+            item = self._texts.get(loc)
+            if item is None:
+                x, y = loc
+                size = self.cell_size
+                self._texts[loc] = self.create_text((x + 0.5) * size, (y + 0.5) * size,
+                                                    text=text, fill=fill, font=self.font)
+            else:
+                self.itemconfigure(item, text=text, fill=fill)
+        self.paint(loc, bg)
+
+
+# Colors mixed together for each pixel of the minimap, as RGB.
+_MINIMAP_COVERED = (191, 191, 191)
+_MINIMAP_CLEARED = (240, 240, 240)
+_MINIMAP_FLAGGED = (205, 0, 0)
+_MINIMAP_FRONTIER = (30, 144, 255)
+
+
+def block_counts(mask, width, height, block):
+    """
+    Count the 1s in each `block` x `block` square of `mask`.
+
+    `mask` holds a 0 or 1 for each Cell of a `width` x `height` board, indexed
+    like the Minefield. The columns of each square are added up as big ints,
+    one byte per row, at most 255 columns at a time so no byte overflows.
+
+    Returns: `list` of rows of counts, top to bottom, each left to right.
+    """
+    columns = -(-width // block)
+    rows = -(-height // block)
+    counts = [[0] * columns for _ in range(rows)]
+    for bx in range(columns):
+        right = min(width, (bx + 1) * block)
+        for left in range(bx * block, right, 255):
+            total = 0
+            for x in range(left, min(right, left + 255)):
+                total += int.from_bytes(mask[x * height:(x + 1) * height], 'little')
+            column = total.to_bytes(height, 'little')
+            for by in range(rows):
+                counts[by][bx] += sum(column[by * block:(by + 1) * block])
+    return counts
+
+
+class Minimap(tkinter.Canvas):
+    """
+    Zoomed-out picture of the whole board, one pixel per square of Cells.
+
+    Each pixel mixes how much of its square is cleared, flagged, and on the
+    frontier. The part of the board in view is outlined, and a click on
+    the minimap brings that part of the board into view.
+
+    Attributes:
+        field (`Minefield`): Board to picture.
+
+        block (`int`): Width and height of the square of Cells behind each pixel.
+
+    Methods:
+        refresh(): Redraw the picture from the Minefield.
+
+        show_view(x, y, columns, rows): Outline the part of the board in view.
+
+        reset(): Start over, sized for the Minefield's current dimensions.
+    """
+
+    def __init__(self, master, field, on_jump, size=MINIMAP_SIZE):
+        super().__init__(master=master, bg=COLORS['covered'], highlightthickness=0)
+        self.field = field
+        self.size = size
+        self.image = tkinter.PhotoImage(master=self)
+        self.create_image(0, 0, image=self.image, anchor='nw')
+        self._view = self.create_rectangle(0, 0, 0, 0, outline=COLORS['active_cell'])
+        self.reset()
+        self.bind("<Button-1>", lambda event: on_jump((event.x * self.block, event.y * self.block)))
+
+    def reset(self):
+        """Start over, sized for the Minefield's current dimensions."""
+        field = self.field
+        self.block = max(1, -(-max(field.width, field.height) // self.size))
+        width = -(-field.width // self.block)
+        height = -(-field.height // self.block)
+        self.config(width=width, height=height)
+        self.image.blank()
+        self.image.config(width=width, height=height)
+
+    def refresh(self):
+        """Redraw the picture from the Minefield."""
+        field = self.field
+        width, height, block = field.width, field.height, self.block
+        cleared = block_counts(field.naked, width, height, block)
+        flagged = block_counts(field.flagged, width, height, block)
+        frontier = block_counts(field.frontier_mask(), width, height, block)
+
+        rows = []
+        for by, (cleared_row, flagged_row, frontier_row) in enumerate(zip(cleared, flagged, frontier)):
+            cells_high = min(block, height - by * block)
+            pixels = []
+            for bx, (c, f, r) in enumerate(zip(cleared_row, flagged_row, frontier_row)):
+                cells = cells_high * min(block, width - bx * block)
+                c, f = c / cells, f / cells
+                # The frontier is only ever a thin line, so it is tinted in strongly.
+                r = min(1.0, 4 * r / cells)
+                rgb = (covered * (1 - c - f) + clear * c + flag * f
+                       for covered, clear, flag in zip(_MINIMAP_COVERED, _MINIMAP_CLEARED, _MINIMAP_FLAGGED))
+                pixels.append("#{:02x}{:02x}{:02x}".format(
+                    *(int(color * (1 - r) + tint * r) for color, tint in zip(rgb, _MINIMAP_FRONTIER))))
+            rows.append("{" + " ".join(pixels) + "}")
+        self.image.put(" ".join(rows))
+
+    def show_view(self, x, y, columns, rows):
+        """Outline the part of the board in view."""
+        block = self.block
+        self.coords(self._view, x / block, y / block, (x + columns) / block - 1, (y + rows) / block - 1)
+
+
+class ViewportBoard(tkinter.Frame):
+    """
+    Scrollable view onto a board far too large to draw in full.
+
+    Only the Cells in view, plus a margin of VIEWPORT_MARGIN on each side, have
+    any Canvas items. Scrolling within the margin just moves the Canvas; past it,
+    the items are thrown away and the new window is drawn from the Minefield.
+    State changes outside the window are ignored, since the Minefield holds
+    them anyway. Only highlights are kept for Cells out of view, so the memory
+    used stays the same however large the board.
+
+    Beside the board, a `Minimap` pictures the whole board, refreshed every
+    MINIMAP_INTERVAL while anything changes.
+
+    Attributes:
+        field (`Minefield`): Board to draw.
+
+        columns (`int`), rows (`int`): Size of the view, in Cells.
+
+        origin (`tuple`): `(x, y)` of the top left Cell in view.
+
+        cell_size (`int`): Width and height of each Cell, in pixels.
+
+        canvas (`tkinter.Canvas`): Draws the Cells.
+
+        minimap (`Minimap`): Pictures the whole board.
+
+    Methods:
+        draw(loc, cell, detonated): Draw `cell` at `loc` based on its state.
+
+        paint(loc, bg): Highlight `loc` with background color `bg`.
+
+        bg(loc): Current background color at `loc`.
+
+        loc_at(px, py): `(x, y)` of the Cell under window coordinates `(px, py)`.
+
+        scroll_to(x, y): Put Cell `(x, y)` at the top left of the view.
+
+        center_on(loc): Put `loc` in the middle of the view.
+
+        follow(loc): Bring `loc` into view, if it isn't already.
+
+        in_view(loc): Whether `loc` has items on the Canvas, in view or in the margin.
+
+        forget(loc): Drop a change to `loc` out of view. Only its highlight is let go.
+
+        detonate(field): Reveal the mines and false flags in view, once the Minefield has detonated.
+
+        xview(*args), yview(*args): Scroll the view. Called by the scrollbars.
+
+        reset(width, height): Start over from the top left, sized for the Minefield.
+    """
+
+    # Cells scrolled per turn of the mouse wheel.
+    WHEEL_CELLS = 3
+
+    def __init__(self, master, field, on_left_click, on_right_click,
+                 cell_size=CELL_SIZE, view_size=VIEWPORT_SIZE, margin=VIEWPORT_MARGIN):
+        super().__init__(master=master)
+        self.field = field
+        self.cell_size = cell_size
+        self.margin = margin
+        self.view_size = view_size
+        self.origin = (0, 0)
+        self.font = ('TkDefaultFont', max(6, cell_size // 2), 'bold')
+
+        self.canvas = tkinter.Canvas(self, bg=COLORS['covered'], highlightthickness=0)
+        self.canvas.grid(row=0, column=0)
+        self.y_scroll = tkinter.Scrollbar(self, orient='vertical', command=self.yview)
+        self.y_scroll.grid(row=0, column=1, sticky='ns')
+        self.x_scroll = tkinter.Scrollbar(self, orient='horizontal', command=self.xview)
+        self.x_scroll.grid(row=1, column=0, sticky='ew')
+        self.minimap = Minimap(self, field, on_jump=self.center_on)
+        self.minimap.grid(row=0, column=2, sticky='n', padx=(4, 0))
+
+        self._refresh_id = None
+
+        self.canvas.bind("<Button-1>", lambda event: self._click(event, on_left_click))
+        self.canvas.bind("<Button-3>", lambda event: self._click(event, on_right_click))
+        self.canvas.bind("<MouseWheel>", lambda event: self._wheel(-1 if event.delta > 0 else 1, event.state & 1))
+        self.canvas.bind("<Button-4>", lambda event: self._wheel(-1, event.state & 1))
+        self.canvas.bind("<Button-5>", lambda event: self._wheel(1, event.state & 1))
+
+        self.reset(field.width, field.height)
+        self._refresh_minimap()
+
+    def reset(self, width, height):
+        """
+        Start over from the top left, sized for the Minefield.
+
+        The Minefield itself already holds the `width` x `height` board.
+        """
+        cell_size = self.cell_size
+        self.columns = min(width, self.view_size[0] // cell_size)
+        self.rows = min(height, self.view_size[1] // cell_size)
+        self.canvas.config(width=self.columns * cell_size, height=self.rows * cell_size,
+                           scrollregion=(0, 0, width * cell_size, height * cell_size))
+
+        # Canvas items of each Cell drawn, as `[rect, text]`, and the Cells they span.
+        self._items = {}
+        self._region = (0, 0, 0, 0)
+        # Highlights that differ from each Cell's own color, in view or not.
+        self._highlights = {}
+        self._changed = True
+
+        self.minimap.reset()
+        self.scroll_to(0, 0)
+
+    def loc_at(self, px, py):
+        """`(x, y)` of the Cell under window coordinates `(px, py)`, or None."""
+        x = int(self.canvas.canvasx(px)) // self.cell_size
+        y = int(self.canvas.canvasy(py)) // self.cell_size
+        if (x, y) in self.field:
+            return x, y
+        return None
+
+    def _click(self, event, callback):
+        loc = self.loc_at(event.x, event.y)
+        if loc is not None:
+            callback(loc)
+
+    def _wheel(self, direction, horizontal):
+        x, y = self.origin
+        if horizontal:
+            self.scroll_to(x + direction * self.WHEEL_CELLS, y)
+        else:
+            self.scroll_to(x, y + direction * self.WHEEL_CELLS)
+
+    @staticmethod
+    def _scrolled(args, first, shown, total):
+        """Where a scrollbar command `args` moves a view of `shown` of `total` Cells, starting at `first`."""
+        if args[0] == 'moveto':
+            return round(float(args[1]) * total)
+        amount = int(args[1])
+        if args[2] == 'pages':
+            amount *= max(1, shown - 1)
+        return first + amount
+
+    def xview(self, *args):
+        x, y = self.origin
+        self.scroll_to(self._scrolled(args, x, self.columns, self.field.width), y)
+
+    def yview(self, *args):
+        x, y = self.origin
+        self.scroll_to(x, self._scrolled(args, y, self.rows, self.field.height))
+
+    def scroll_to(self, x, y):
+        """Put Cell `(x, y)` at the top left of the view, as near as the edges allow."""
+        field = self.field
+        x = max(0, min(x, field.width - self.columns))
+        y = max(0, min(y, field.height - self.rows))
+        self.origin = (x, y)
+
+        left, top, right, bottom = self._region
+        if not (left <= x and x + self.columns <= right and top <= y and y + self.rows <= bottom):
+            self._render()
+
+        self.canvas.xview_moveto(x / field.width)
+        self.canvas.yview_moveto(y / field.height)
+        self.x_scroll.set(x / field.width, (x + self.columns) / field.width)
+        self.y_scroll.set(y / field.height, (y + self.rows) / field.height)
+        self.minimap.show_view(x, y, self.columns, self.rows)
+
+    def center_on(self, loc):
+        """Put `loc` in the middle of the view."""
+        self.scroll_to(loc[0] - self.columns // 2, loc[1] - self.rows // 2)
+
+    def follow(self, loc):
+        """Bring `loc` into view, if it isn't already."""
+        x0, y0 = self.origin
+        if not (x0 <= loc[0] < x0 + self.columns and y0 <= loc[1] < y0 + self.rows):
+            self.center_on(loc)
+
+    def _render(self):
+        """Throw away every item, and draw the view plus its margin from the Minefield."""
+        canvas = self.canvas
+        field = self.field
+        size = self.cell_size
+        x, y = self.origin
+        left, top = max(0, x - self.margin), max(0, y - self.margin)
+        right = min(field.width, x + self.columns + self.margin)
+        bottom = min(field.height, y + self.rows + self.margin)
+        self._region = (left, top, right, bottom)
+
+        canvas.delete('all')
+        self._items = {}
+        canvas.create_rectangle(left * size, top * size, right * size, bottom * size,
+                                fill=COLORS['covered'], width=0)
+        for column in range(left + 1, right):
+            canvas.create_line(column * size, top * size, column * size, bottom * size, fill=COLORS[0])
+        for row in range(top + 1, bottom):
+            canvas.create_line(left * size, row * size, right * size, row * size, fill=COLORS[0])
+
+        # Plain covered Cells are already drawn by the background.
+        naked, flagged, mined = field.naked, field.flagged, field.mined
+        detonated = field.detonated
+        highlights = self._highlights
+        for column in range(left, right):
+            base = column * field.height
+            for row in range(top, bottom):
+                i = base + row
+                loc = column, row
+                if naked[i] or flagged[i] or (detonated and mined[i]) or loc in highlights:
+                    self._draw_items(loc, *appearance(field[loc], detonated)[:3])
+
+    def in_view(self, loc):
+        left, top, right, bottom = self._region
+        return left <= loc[0] < right and top <= loc[1] < bottom
+
+    def forget(self, loc):
+        self._highlights.pop(loc, None)
+        self._changed = True
+
+    def detonate(self, field):
+        # Only the window is drawn; the rest is drawn from the Minefield once scrolled to.
+        self._render()
+
+    def _draw_items(self, loc, text, fg, bg):
+        """Create or update the items of `loc`. Its highlight, if any, takes the place of `bg`."""
+        canvas = self.canvas
+        bg = self._highlights.get(loc, bg)
+        items = self._items.get(loc)
+        if items is None:
+            if bg == 'covered' and text == ' ':
+                return
+            items = self._items[loc] = [None, None]
+
+        x, y = loc
+        size = self.cell_size
+        rect, item = items
+        if rect is None:
+            if bg != 'covered':
+                items[0] = canvas.create_rectangle(x * size + 1, y * size + 1, (x + 1) * size, (y + 1) * size,
+                                                   fill=COLORS[bg], width=0)
+                if item is not None:
+                    canvas.tag_raise(item, items[0])
+        else:
+            canvas.itemconfigure(rect, fill=COLORS[bg])
+
+        fill = COLORS[fg] if fg is not None else ''
+        if item is None:
+            if text != ' ':
+                items[1] = canvas.create_text((x + 0.5) * size, (y + 0.5) * size,
+                                              text=text, fill=fill, font=self.font)
+        else:
+            canvas.itemconfigure(item, text=text, fill=fill)
+
+    def bg(self, loc):
+        highlight = self._highlights.get(loc)
+        if highlight is not None:
+            return highlight
+        return appearance(self.field[loc], self.field.detonated)[2]
+
+    def paint(self, loc, bg):
+        if bg not in COLORS:
+            return
+        text, fg, own_bg, relief = appearance(self.field[loc], self.field.detonated)
+        if bg == own_bg:
+            self._highlights.pop(loc, None)
+        else:
+            self._highlights[loc] = bg
+        if self.in_view(loc):
+            self._draw_items(loc, text, fg, own_bg)
+
+    def draw(self, loc, cell, detonated=False):
+        # A new state replaces any highlight.
+        self._highlights.pop(loc, None)
+        self._changed = True
+        if self.in_view(loc):
+            self._draw_items(loc, *appearance(cell, detonated)[:3])
+
+    def _refresh_minimap(self):
+        if self._changed:
+            self._changed = False
+            self.minimap.refresh()
+        self._refresh_id = self.after(MINIMAP_INTERVAL, self._refresh_minimap)
+
+    def destroy(self):
+        if self._refresh_id is not None:
+            self.after_cancel(self._refresh_id)
+            self._refresh_id = None
+        super().destroy()
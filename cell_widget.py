@@ -0,0 +1,79 @@
+import tkinter
+from game_settings import COLORS
+
+
+def appearance(cell, detonated=False):
+    """
+    How to draw `cell`, based on its state.
+
+    Once `detonated`, also reveals un-flagged mines and false flags.
+
+    Returns: `tuple` of `(text, fg, bg, relief)`. `fg` and `bg` are indices in the
+             COLORS dictionary in game_settings.py; `fg` is None for blank cells.
+    """
+    if cell.is_naked:
+        if cell.is_mined:
+            return 'X', 'mistake', 'boom_bg', 'sunken'
+        return cell.surrounding_mines, cell.surrounding_mines, 'naked', 'sunken'
+    if cell.is_flagged:
+        if detonated and not cell.is_mined:
+            return 'F', 'mistake', 'bad_flag', 'raised'
+        return 'F', 'F', 'flagged', 'raised'
+    if detonated and cell.is_mined:
+        return 'X', 'mine_fg', 'mine_bg', 'raised'
+    return ' ', None, 'covered', 'raised'
+
+
+class CellWidget(tkinter.Label):
+    """
+    Displays a single Cell. Inherits from tkinter.Label.
+
+    The Minefield holds all of the state; this widget only draws it.
+    Only configures Tk when something visible actually changes.
+
+    Attributes:
+        bg (`str`): Current background color.
+                    This is an index in the COLORS dictionary in game_settings.py
+
+    Methods:
+        paint(bg): Highlight with background color `bg`.
+
+        draw(cell, detonated): Draw `cell` based on its state.
+
+        reset(): Draw as a covered Cell again.
+    """
+
+    def __init__(self, master):
+        super().__init__(master=master, font='bold', width=2,
+                         relief='raised', text=' ', bg=COLORS['covered'])
+        self.bg = 'covered'
+        self._drawn = ' ', None, 'raised'
+
+    def paint(self, bg: str) -> None:
+        """Highlight with background color `bg`."""
+        if bg in COLORS and bg != self.bg:
+            self.bg = bg
+            self.config(bg=COLORS[bg])
+
+    def draw(self, cell, detonated=False) -> None:
+        """
+        Draw `cell` based on its state.
+
+        Once `detonated`, also reveals un-flagged mines and false flags.
+        """
+        text, fg, bg, relief = appearance(cell, detonated)
+        drawn = text, fg, relief
+        if drawn != self._drawn:
+            self._drawn = drawn
+            if fg is None:
+                self.config(text=text, relief=relief)
+            else:
+                self.config(text=text, fg=COLORS[fg], relief=relief)
+        self.paint(bg)
+
+    def reset(self) -> None:
+        """Draw as a covered Cell again."""
+        if self._drawn != (' ', None, 'raised'):
+            self._drawn = ' ', None, 'raised'
+            self.config(text=' ', relief='raised')
+        self.paint('covered')
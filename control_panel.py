@@ -88,6 +88,15 @@ class DisplayPanel(tk.LabelFrame):
     """
     Provides functionality to visualize the execution of certain processes
     which are executed during gameplay.
+
+    Pause times and highlights can be changed while the solver is running.
+    It can also be paused, then stepped through one showcase at a time.
+
+    Attributes:
+        paused (`tkinter.BooleanVar`): If True, the solver waits.
+
+        pause_check (`tkinter.Checkbutton`), step_button (`tkinter.Button`):
+            Commands are set by the main window.
     """
 
     def __init__(self, master):
@@ -110,6 +119,13 @@ class DisplayPanel(tk.LabelFrame):
         self.redundant_settings = DisplaySettings(master=self, row=5, text="remove redundant", color_strs=['redundant'])
         self.hyper_queue_settings = DisplaySettings(master=self, row=6, text="hyper queue", color_strs=['hyper_queue'])
 
+        self.paused = tk.BooleanVar(value=False)
+        self.pause_check = tk.Checkbutton(master=self, text="Pause solving", variable=self.paused)
+        self.pause_check.grid(row=7, column=1)
+
+        self.step_button = tk.Button(master=self, text="Step")
+        self.step_button.grid(row=7, column=2)
+
 
 class NewGamePanel(tk.LabelFrame):
     """Allows the player to start a new game with the given settings."""
@@ -138,6 +154,62 @@ class NewGamePanel(tk.LabelFrame):
         self.replay_button = tk.Button(master=self, text="Replay")
         self.replay_button.grid(row=4, column=0, columnspan=2)
 
+        self.trace_button = tk.Button(master=self, text="Play Trace...")
+        self.trace_button.grid(row=5, column=0, columnspan=2)
+
+
+class StatsPanel(tk.LabelFrame):
+    """
+    Shows the solver's counters and timers live. See solver_stats.py
+
+    Attributes:
+        stats_label (`tkinter.Label`): The latest counters and timers.
+
+        note_label (`tkinter.Label`): Where the last dump or profile was written.
+
+        profile_next (`tkinter.BooleanVar`): If True, the next click is solved
+                                             in the background under cProfile.
+
+        dump_button (`tkinter.Button`): Command is set by the main window.
+
+    Methods:
+        show(snapshot): Show a `SolverStats.snapshot()`.
+    """
+
+    def __init__(self, master):
+        super().__init__(master=master, text="Instruments")
+
+        self.stats_label = tk.Label(master=self, font='TkFixedFont', justify='left', anchor='w')
+        self.stats_label.grid(row=0, column=0, columnspan=2, sticky='w')
+
+        self.profile_next = tk.BooleanVar(value=False)
+        self.profile_check = tk.Checkbutton(master=self, text="Profile next solve", variable=self.profile_next)
+        self.profile_check.grid(row=1, column=0)
+
+        self.dump_button = tk.Button(master=self, text="Dump JSON")
+        self.dump_button.grid(row=1, column=1)
+
+        self.note_label = tk.Label(master=self, text="", fg="gray50")
+        self.note_label.grid(row=2, column=0, columnspan=2)
+
+    def show(self, snapshot):
+        """Show a `SolverStats.snapshot()`."""
+        outcomes = snapshot["block_outcomes"]
+        lines = [
+            "blocks {:>9,}  clear/flag/? {}/{}/{}".format(snapshot["blocks"], outcomes["clear"],
+                                                          outcomes["flag"], outcomes["?"]),
+            "pairs  {:>9,}  hits {:,}".format(snapshot["neighborhood_solves"], snapshot["neighborhood_hits"]),
+            "uncover{:>9,}  flags {:,}/-{:,}".format(snapshot["uncovers"], snapshot["flags"], snapshot["un_flags"]),
+            "queue     steps  orient    peak     time",
+        ]
+        for name in ("clear_queue", "auto_queue", "hyper_queue"):
+            lines.append("{:<6}{:>9,}{:>8,}{:>8,}{:>8.3f}s".format(
+                name[:-6], snapshot["steps"][name], snapshot["re_orients"][name],
+                snapshot["peak_queue_lengths"][name], snapshot["time"][name]))
+        lines.append("frontier {:.3f}s  guess {:.3f}s".format(snapshot["time"]["frontier"],
+                                                              snapshot["time"]["guess"]))
+        self.stats_label.config(text="\n".join(lines))
+
 
 class ControlPanel(tk.Frame):
     """Frame containing all of the settings and functionality."""
@@ -171,17 +243,41 @@ class ControlPanel(tk.Frame):
                                                 variable=self.hyper_solving)
         self.hyper_solve_check.grid(row=4, column=0)
 
+        self.frontier_solving = tk.BooleanVar(value=True)
+        self.frontier_solve_check = tk.Checkbutton(master=self, text="Frontier Solve (exact logic)",
+                                                   variable=self.frontier_solving)
+        self.frontier_solve_check.grid(row=5, column=0)
+
+        self.guessing = tk.BooleanVar(value=False)
+        self.guess_check = tk.Checkbutton(master=self, text="Guess When Stuck (safest cell)",
+                                          variable=self.guessing)
+        self.guess_check.grid(row=6, column=0)
+
+        self.background_solving = tk.BooleanVar(value=False)
+        self.background_check = tk.Checkbutton(master=self, text="Solve in Background (full speed)",
+                                               variable=self.background_solving)
+        self.background_check.grid(row=7, column=0)
+
+        self.rate_label = tk.Label(master=self, text="", fg="gray50")
+        self.rate_label.grid(row=8, column=0)
+
         self.direction_panel = DirectionPanel(master=self)
-        self.direction_panel.grid(row=5, column=0)
+        self.direction_panel.grid(row=9, column=0)
 
         self.display_panel = DisplayPanel(master=self)
-        self.display_panel.grid(row=6, column=0)
+        self.display_panel.grid(row=10, column=0)
 
         self.new_game_panel = NewGamePanel(master=self)
-        self.new_game_panel.grid(row=7, column=0)
+        self.new_game_panel.grid(row=11, column=0)
+
+        self.stats_panel = StatsPanel(master=self)
+        self.stats_panel.grid(row=12, column=0)
 
     def _enable_hyper_check(self):
         if self.auto_solving.get():
-            self.hyper_solve_check["state"] = "normal"
+            state = "normal"
         else:
-            self.hyper_solve_check["state"] = "disabled"
+            state = "disabled"
+        self.hyper_solve_check["state"] = state
+        self.frontier_solve_check["state"] = state
+        self.guess_check["state"] = state
@@ -0,0 +1,687 @@
+import random
+from time import perf_counter
+from game_settings import Setting, Emphasis, GAME_OVER_MSG, ALL_CLEAR_MSG, ACTIVE_FIELD_MSG
+from minefield import Minefield
+from solving_queue import Queue, SuperQueue
+from neighborhood import Block, Neighborhood
+from frontier import Frontier
+from probability import Probabilities
+from solver_stats import SolverStats
+from solver_trace import (UNCOVER, FLAG, UN_FLAG, CLEAR, USER, BLOCK, NEIGHBORHOOD, FRONTIER, GUESS,
+                          NO_QUEUE, AUTO_QUEUE, HYPER_QUEUE)
+
+
+EMPHASIS_NAMES = ("clear_queue", "auto_queue", "add_batch", "redundant", "to_flag", "hyper_queue")
+
+# Emphasis to showcase each traced action with, while playing back a trace.
+TRACE_EMPHASIS = {UNCOVER: "clear_queue", FLAG: "to_flag", UN_FLAG: "to_flag", CLEAR: "add_batch"}
+
+
+class Engine:
+    """
+    Headless solving engine. Holds all of the game logic, no tkinter required.
+
+    A view (such as `Game`) may be attached to display the counters and status.
+
+    Attributes:
+
+        field (`Minefield`): Minefield holding the board state, indexed by `(x, y)` tuples.
+
+        percent_mined (`float`): Percent of cells requested to be mined.
+
+        is_new (`bool`): If True, there are still no mines in the Minefield.
+                         Once the first Cell is uncovered, mines are placed
+                         and `is_new` is set to False.
+
+        game_over (`bool`): If True, player lost (uncovered a mined cell)
+                            No more moves are allowed.
+
+        win (`bool`): If True, player won (all un-mined cells are clear).
+                      No more moves are allowed.
+
+        status (`str`): `Property`. Status message.
+
+        mines_left (`int`): `Property`. Number of mines left to flag.
+
+        safes_left (`int`): `Property`. Number of safe cells left to clear.
+
+        auto_solving: `auto_solving` setting. Anything with a `get()` method,
+                      such as the checkbutton variable in the control panel.
+
+        hyper_solving: `hyper_solving` setting. Same as `auto_solving`.
+
+        frontier_solving: `frontier_solving` setting. Same as `auto_solving`.
+                          Once every queue runs dry, solves each independent
+                          group of constraints along the frontier exactly.
+
+        guessing: `guessing` setting. Same as `auto_solving`. Once nothing else
+                  can be done, uncovers the cell least likely to be mined.
+
+        probabilities (`Probabilities`): Mine probability of every unknown cell.
+
+        last_guess (`tuple`): `(loc, probability)` of the latest guess, if any.
+
+        direction: `direction` setting. Anything with a `get()` method,
+                   such as the `direction` variable in the direction panel.
+
+        clear_queue (`SuperQueue`): Ordered set of covered cells in line
+                                    to be cleared.
+
+        auto_queue (`SuperQueue`): Ordered set of naked cells in line
+                                   for their neighbors to be analyzed and solved.
+
+        hyper_queue (`SuperQueue`): Ordered set of cells which could not be solved
+                                    by analyzing their immediate Block.
+                                    Leftovers from the auto-queue.
+
+        emphasis (`dict`): Settings used to showcase each procedure.
+                           Headless, these do nothing. With a display, these are
+                           the appropriate settings in the display panel, which
+                           the display showcases while driving the step generators.
+
+        seed (`int`): Seed for mine placement. If None, the Minefield draws one
+                      at random and keeps it as `field.seed`.
+
+        trace: Records every move, such as a `TraceRecorder` from solver_trace.py.
+               Needs `record(step, loc, action, rule, queue)` and `record_board(board)`.
+               None to record nothing.
+
+        steps (`int`): Number of steps taken from the queues so far.
+
+        stats (`SolverStats`): Counters and timers for the hot paths. See solver_stats.py
+
+        view: Displays the counters and status. Needs `show_status(msg)`,
+              `show_mines_left(mines_left)` and `show_safes_left(safes_left)`.
+              None when headless.
+
+    Methods:
+
+        uncover(loc): Uncovers cell at coordinates `loc`.
+                      Populates the appropriate Queue based on result and surroundings.
+
+        toggle_flag(loc): Toggles flag at coordinates `loc`.
+                          Populates the `auto_queue` based on surroundings.
+
+        solve_block(center_cell): Takes action based on `center_cell`'s neighbors.
+
+        solve_neighborhood(cell_a, cell_b): Takes action based on two overlapping Blocks.
+
+        solve_frontier(): Takes action based on every constraint along the Frontier.
+
+        guess(): Uncovers the cell least likely to be mined.
+
+        step(queue): Passes the next value in `queue` to the appropriate method.
+
+        run(): Steps through all of the queues, in order of priority, until they are empty.
+
+        stop(): Stops solving for good, at the next step.
+
+        left_click(loc): Places mines if needed, then uncovers or solves `loc`.
+
+        solve_steps(), click_steps(loc), flag_steps(loc): Generator versions of run(),
+            left_click() and toggle_flag(), which yield the name of each emphasis
+            to showcase, so a display can drive them without blocking.
+            The blocking versions run straight through, showcasing nothing.
+
+        restore(data): Lays out the mines of an encoded board, instead of placing them at random.
+
+        trace_steps(player): Generator. Plays back a trace without solving.
+
+        reset(width, height, percent_mined, seed): Starts a new game in place.
+    """
+
+    def __init__(self, width, height, percent_mined, auto_solving=None, hyper_solving=None,
+                 frontier_solving=None, guessing=None, direction=None, emphasis=None, view=None, seed=None):
+
+        self.view = view
+        self._status = ACTIVE_FIELD_MSG
+        self._mines_left = 0
+        self._safes_left = 0
+
+        self.auto_solving = auto_solving or Setting(True)
+        self.hyper_solving = hyper_solving or Setting(True)
+        self.frontier_solving = frontier_solving or Setting(True)
+        self.guessing = guessing or Setting(False)
+        self.direction = direction or Setting("LIFO")
+        self.trace = None
+
+        self.field = Minefield(width, height, 0)
+
+        # Orders the queues for the "random" direction.
+        self._rng = random.Random(seed)
+        self.clear_queue = SuperQueue(self.field, color="clear_queue", direction_var=self.direction, rng=self._rng)
+        self.auto_queue = SuperQueue(self.field, color="auto_queue", direction_var=self.direction, rng=self._rng)
+        self.hyper_queue = SuperQueue(self.field, color="hyper_queue", direction_var=self.direction, rng=self._rng)
+
+        self.emphasis = {name: Emphasis() for name in EMPHASIS_NAMES}
+        if emphasis:
+            self.emphasis.update(emphasis)
+
+        self.stats = SolverStats(self)
+        self.reset(width, height, percent_mined, seed)
+
+    def reset(self, width, height, percent_mined, seed=None):
+        """
+        Starts a new game on a `width` x `height` board, in place.
+
+        Keeps the same Minefield and queues, so any view attached carries on.
+        Must not be called while solving. Stop and close any step generators first.
+        """
+        self.width = width
+        self.height = height
+        self.percent_mined = percent_mined
+
+        # The following lines prevent an infinite loop at mine placement
+        #  if percent_mined is set too high.
+        total_cells = width * height
+        total_mines_allowed = total_cells - 9
+        total_mines_requested = round(total_cells * percent_mined / 100)
+
+        total_mines = min(total_mines_requested, total_mines_allowed)
+
+        self.field.reset(width, height, total_mines)
+
+        self.seed = seed
+        self._rng.seed(seed)
+
+        self.is_new = True
+        self.game_over = False
+        self.win = False
+
+        self.status = ACTIVE_FIELD_MSG
+        self.mines_left = total_mines
+        self.safes_left = total_cells - total_mines
+
+        self._frontier_cache = {}
+        self._running = False
+
+        self.steps = 0
+        self._stopped = False
+        # Rule and queue which sent each cell to the `clear_queue`, while tracing.
+        self._clear_sources = {}
+
+        self.probabilities = Probabilities(self.field)
+        self.last_guess = None
+
+        for solving_queue in (self.clear_queue, self.auto_queue, self.hyper_queue):
+            solving_queue.clear()
+            solving_queue.peak_length = 0
+            solving_queue.re_orients = 0
+        self.stats.reset()
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, status):
+        self._status = status
+        if self.view:
+            self.view.show_status(status)
+
+    @property
+    def mines_left(self):
+        return self._mines_left
+
+    @mines_left.setter
+    def mines_left(self, mines_left):
+        self._mines_left = mines_left
+        if self.view:
+            self.view.show_mines_left(mines_left)
+
+    @property
+    def safes_left(self):
+        return self._safes_left
+
+    @safes_left.setter
+    def safes_left(self, safes_left):
+        self._safes_left = safes_left
+        if self.view:
+            self.view.show_safes_left(safes_left)
+
+    def _drain(self, steps):
+        """
+        Runs the generator `steps` to the end, without stopping to showcase anything.
+
+        Returns: Whatever `steps` returns.
+        """
+        try:
+            while True:
+                next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+    def stop(self):
+        """Stops solving at the next step. Safe to call from another thread."""
+        self._stopped = True
+
+    def run(self):
+        """
+        Drives all of the queues from a single loop until they run dry.
+        Blocks until done. See solve_steps().
+        """
+        self._drain(self.solve_steps())
+
+    def solve_steps(self):
+        """
+        Generator. Drives all of the queues from a single loop until they run dry.
+
+        Each pass takes one step from the highest priority queue with
+        anything in it: `clear_queue`, then `auto_queue`, then `hyper_queue`.
+        Once they are all empty, tries the Frontier and then a guess,
+        and keeps going for as long as either feeds the queues.
+
+        Yields the name of the emphasis to showcase, wherever there is
+        something to show, so a display can pause there without blocking.
+        If already running, returns immediately; the running loop will
+        pick up whatever was just queued. Stops early once stop() is called.
+        """
+        if self._running:
+            return
+        self._running = True
+        try:
+            while not self._stopped:
+                if self.clear_queue:
+                    yield from self._timed(self._step(self.clear_queue), "clear_queue")
+                elif self.auto_queue:
+                    yield from self._timed(self._step(self.auto_queue), "auto_queue")
+                elif self.hyper_queue:
+                    yield from self._timed(self._step(self.hyper_queue), "hyper_queue")
+                elif not self.auto_solving.get():
+                    break
+                elif not ((yield from self._timed(self._solve_frontier(), "frontier"))
+                          or (yield from self._timed(self._guess(), "guess"))):
+                    break
+        finally:
+            self._running = False
+
+    def _timed(self, steps, name):
+        """
+        Generator. Runs `steps`, adding the time spent inside it to `stats.time[name]`.
+        Time spent suspended, such as showcasing, isn't counted.
+        """
+        spent = 0.0
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    emphasis = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    spent += perf_counter() - start
+                yield emphasis
+        finally:
+            steps.close()
+            self.stats.time[name] += spent
+
+    def uncover(self, loc: tuple[int, int]) -> None:
+        """
+        Uncovers cell at coordinates `loc`.
+
+        If the now naked (and hopefully un-mined) cell has no mined neighbors,
+        uncovers the whole opening around it, along with its numbered border,
+        in one go.
+
+        If `auto_solving` is checked, adds every newly naked cell, and any naked
+        neighbor, which still has unknown neighbors to the `auto_queue`.
+        """
+        self._drain(self._uncover(loc))
+
+    def _uncover(self, loc: tuple[int, int]):
+        if loc in self.clear_queue:
+            self.clear_queue.remove(loc)
+
+        cell = self.field[loc]
+        if cell.is_naked or cell.is_flagged:
+            # Flagged since it was queued, such as by the player mid-solve.
+            self._clear_sources.pop(loc, None)
+            return
+
+        if self.trace:
+            rule, queue = self._clear_sources.pop(loc, (USER, NO_QUEUE))
+            self.trace.record(self.steps, loc, UNCOVER, rule, queue)
+
+        self.stats.uncovers += 1
+        self.field.uncover(loc)
+
+        if self.field.is_triggered():
+            self.game_over = True
+            [queue.clear() for queue in
+             (self.clear_queue, self.auto_queue, self.hyper_queue)]
+            self.status = GAME_OVER_MSG
+            return
+
+        uncovered = [self.field.index(loc)]
+        uncovered.extend(self.field.open_region(loc))
+        self.safes_left -= len(uncovered)
+
+        if self.field.is_all_clear():
+            self.win = True
+            self.status = ALL_CLEAR_MSG
+
+        if len(uncovered) > 1:
+            for i in uncovered:
+                cell = self.field.loc(i)
+                if cell in self.clear_queue:
+                    self.clear_queue.remove(cell)
+                    self._clear_sources.pop(cell, None)
+
+        if self.auto_solving.get():
+            table = self.field.neighbor_table
+            touched = set(uncovered)
+            for i in uncovered:
+                touched.update(table[i])
+            naked = self.field.naked
+            num_unknown_neighbors = self.field.num_unknown_neighbors
+            useful_neighbors = {self.field.loc(i) for i in touched
+                                if naked[i] and num_unknown_neighbors[i]}
+            [self.hyper_queue.remove(cell) for cell in useful_neighbors]
+            for _ in self.auto_queue.add_batch_steps(useful_neighbors, color="new_auto"):
+                yield "add_batch"
+            touched = [self.field.loc(i) for i in touched]
+            for _ in self.auto_queue.clean_up_steps(cells=touched):
+                yield "redundant"
+            for _ in self.hyper_queue.clean_up_steps(cells=touched):
+                yield "redundant"
+
+    def toggle_flag(self, loc: tuple[int, int], auto_flag=True, rule=USER, queue=NO_QUEUE) -> None:
+        """
+        Toggle flag at location `loc`.
+
+        If cell at `loc` has any useful neighbors, adds them to the `auto_queue`.
+        Unless `auto_flag`, then solves whatever that leads to.
+
+        `rule` and `queue` say where the decision came from, for the trace.
+        """
+        self._drain(self.flag_steps(loc, auto_flag, rule, queue))
+
+    def flag_steps(self, loc: tuple[int, int], auto_flag=True, rule=USER, queue=NO_QUEUE):
+        """Generator version of toggle_flag(). See solve_steps()"""
+        if self.game_over or self.field[loc].is_naked:
+            return
+
+        if self.field[loc].is_flagged:
+            self.field.un_flag(loc)
+            self.mines_left += 1
+            self.stats.un_flags += 1
+            action = UN_FLAG
+        else:
+            self.field.flag(loc)
+            self.mines_left -= 1
+            self.stats.flags += 1
+            action = FLAG
+
+        if self.trace:
+            self.trace.record(self.steps, loc, action, rule, queue)
+
+        if self.auto_solving.get():
+            block = Block(self.field, loc)
+            useful_neighbors = {neighbor for neighbor in block.naked_neighbors
+                                if self.field.has_unknown_neighbors(neighbor)}
+            [self.hyper_queue.remove(cell) for cell in useful_neighbors]
+            for _ in self.auto_queue.add_batch_steps(useful_neighbors, color="new_auto"):
+                yield "add_batch"
+        if not auto_flag:
+            yield from self.solve_steps()
+
+    def solve_block(self, center_cell: tuple[int, int], queue=AUTO_QUEUE):
+        """
+        Creates a Block around `center_cell` and calls that Block's
+         solve() method.
+
+        If the Block's solve() method returns "clear",
+         uncovers unknown neighbors.
+
+        If the Block's solve() method returns "flag",
+         flags unknown neighbors.
+
+        If the Block's solve() method does not reach a clear decision,
+         passes the `center_cell` coordinates to the `hyper_queue`
+
+        Args:
+            center_cell: `tuple`. Coordinates.
+            queue: Where `center_cell` came from, for the trace.
+        """
+        self._drain(self._solve_block(center_cell, queue))
+
+    def _solve_block(self, center_cell: tuple[int, int], queue=AUTO_QUEUE):
+        block = Block(self.field, center_cell)
+        action = block.solve()
+        self.stats.block_outcomes[action] += 1
+        if action == 'clear':
+            yield from self._queue_clear(block.unknown_neighbors, BLOCK, queue)
+        elif action == 'flag':
+            yield from self._flag_all(block.unknown_neighbors, BLOCK, queue)
+        elif self.hyper_solving.get() and center_cell not in self.hyper_queue:
+            self.hyper_queue.append(center_cell)
+            for neighbor in block.naked_neighbors:
+                if neighbor in self.hyper_queue or neighbor in self.auto_queue:
+                    continue
+                if self.field.has_unknown_neighbors(neighbor):
+                    self.hyper_queue.append(neighbor)
+
+    def solve_neighborhood(self, cell_a, cell_b):
+        """
+        Creates a Neighborhood of `cell_a` and `cell_b` and calls its solve() method.
+
+        Queues up any cells to clear and flags any cells to flag.
+        """
+        self._drain(self._solve_neighborhood(cell_a, cell_b))
+
+    def _solve_neighborhood(self, cell_a, cell_b):
+        self.field[cell_a].bg = "naked"
+        self.field[cell_b].bg = "hyper_queue"
+        clear_set, flag_set = Neighborhood(self.field, cell_a, cell_b).solve()
+        self.stats.neighborhood_solves += 1
+        if clear_set or flag_set:
+            self.stats.neighborhood_hits += 1
+        if clear_set:
+            yield from self._queue_clear(clear_set, NEIGHBORHOOD, HYPER_QUEUE)
+        if flag_set:
+            yield from self._flag_all(flag_set, NEIGHBORHOOD, HYPER_QUEUE)
+
+    def solve_frontier(self) -> bool:
+        """
+        Solves every independent Component of the Frontier exactly.
+
+        Queues up any cells to clear and flags any cells to flag.
+        Only called once all of the queues have run dry.
+
+        Returns: True if anything was found to clear or flag.
+        """
+        return self._drain(self._solve_frontier())
+
+    def _solve_frontier(self):
+        if not self.frontier_solving.get() or self.is_new or self.game_over or self.win:
+            return False
+
+        frontier = Frontier(self.field, cache=self._frontier_cache)
+        self._frontier_cache = {component.signature: component for component in frontier.components}
+        clear_set, flag_set = frontier.solve()
+        if clear_set:
+            yield from self._queue_clear(clear_set, FRONTIER, NO_QUEUE)
+        if flag_set:
+            yield from self._flag_all(flag_set, FRONTIER, NO_QUEUE)
+        return bool(clear_set or flag_set)
+
+    def guess(self) -> bool:
+        """
+        Uncovers the unknown cell least likely to be mined.
+
+        Only called once all of the queues have run dry and the Frontier
+        has nothing left to clear or flag.
+
+        Returns: True if a guess was made.
+        """
+        return self._drain(self._guess())
+
+    def _guess(self):
+        if not self.guessing.get() or self.is_new or self.game_over or self.win:
+            return False
+
+        safest = self.probabilities.safest(self.mines_left)
+        if safest is None:
+            return False
+
+        self.last_guess = safest
+        loc, odds = safest
+        yield from self._queue_clear({loc}, GUESS, NO_QUEUE)
+        return True
+
+    def _queue_clear(self, cells, rule, queue):
+        """
+        Adds `cells` to the `clear_queue`.
+
+        `rule` and `queue` say where the decision came from, for the trace.
+        """
+        if self.trace:
+            for cell in cells:
+                if cell not in self.clear_queue:
+                    self._clear_sources[cell] = rule, queue
+                    self.trace.record(self.steps, cell, CLEAR, rule, queue)
+        for _ in self.clear_queue.add_batch_steps(cells, color="new_clear"):
+            yield "add_batch"
+
+    def _flag_all(self, cells, rule=USER, queue=NO_QUEUE):
+        """
+        Highlights all `cells`, then flags them one by one.
+
+        `rule` and `queue` say where the decision came from, for the trace.
+        """
+        to_flag = Queue(field=self.field, color="to_flag")
+        for cell in cells:
+            to_flag.append(cell)
+        to_flag.direction = self.direction
+        to_flag.re_orient()
+        yield "to_flag"
+        while to_flag:
+            new_flag = to_flag.first()
+            to_flag.remove(new_flag)
+            yield from self.flag_steps(new_flag, rule=rule, queue=queue)
+
+    def step(self, queue: SuperQueue):
+        """
+        Passes the next value in `queue` to the appropriate method.
+        Adds emphasis.
+
+        If `queue` being processed is the `clear_queue`,
+         passes the value to the `uncover` method.
+
+        If `queue` being processed is the `auto_queue`,
+         passes the value to the `solve_block` method.
+
+        If `queue` being processed is the `hyper_queue`,
+         pairs the value with every nearby value sharing unknown neighbors
+         and passes both to the `solve_neighborhood` method.
+
+        Args:
+            queue: `SuperQueue` to process.
+                    Can be `clear_queue`, `auto_queue`, or `hyper_queue`
+        """
+        self._drain(self._step(queue))
+
+    def _step(self, queue: SuperQueue):
+        next_cell = queue.peek()
+        self.steps += 1
+        self.stats.steps[queue.color] += 1
+
+        self.field[next_cell].bg = "active_cell"
+
+        if queue is self.clear_queue:
+            yield "clear_queue"
+            yield from self._uncover(next_cell)
+
+        elif queue is self.auto_queue:
+            yield "auto_queue"
+            queue.remove(next_cell)
+            yield from self._solve_block(next_cell)
+
+        elif queue is self.hyper_queue:
+            queue.remove(next_cell)
+            block_a = Block(self.field, next_cell)
+            unknowns_a = block_a.unknown_neighbors
+
+            for cell_b in queue.near(next_cell):
+                block_b = Block(self.field, cell_b)
+                unknowns_b = block_b.unknown_neighbors
+                if unknowns_a & unknowns_b and unknowns_a.symmetric_difference(unknowns_b):
+                    self.field[next_cell].bg = "active_cell"
+                    self.field[cell_b].bg = "neighbor_cell"
+                    yield "hyper_queue"
+                    yield from self._solve_neighborhood(next_cell, cell_b)
+
+    def restore(self, data: bytes):
+        """
+        Lays out the mines of a board encoded by `Minefield.encode()`,
+        instead of placing them at random on the first click.
+
+        Only for a board which has not been played yet.
+
+        Raises: ValueError if `data` is not an encoded board of the same size.
+        """
+        self.field.restore(data)
+        if self.trace:
+            self.trace.record_board(data)
+        self.is_new = False
+        self.seed = self.field.seed
+        self.mines_left = self.field.total_mines - self.field.flagged.count(1)
+        self.safes_left = len(self.field) - self.field.total_mines - self.field.num_naked_safe
+
+    def trace_steps(self, player):
+        """
+        Generator. Plays back the events of a `TracePlayer` without solving,
+        keeping the counters, status and outcome up to date as it goes.
+
+        The board must already hold the traced board. See restore()
+
+        Yields the name of the emphasis to showcase each event with, like solve_steps().
+        """
+        field = self.field
+        for event in player.apply(field):
+            self.steps = event.step
+            if event.action == UNCOVER:
+                self.stats.uncovers += 1
+                self.safes_left = len(field) - field.total_mines - field.num_naked_safe
+                if field.triggered:
+                    self.game_over = True
+                    self.status = GAME_OVER_MSG
+                elif field.is_all_clear():
+                    self.win = True
+                    self.status = ALL_CLEAR_MSG
+            elif event.action == FLAG:
+                self.stats.flags += 1
+                self.mines_left -= 1
+            elif event.action == UN_FLAG:
+                self.stats.un_flags += 1
+                self.mines_left += 1
+            yield TRACE_EMPHASIS[event.action]
+
+    def left_click(self, loc: tuple[int, int]):
+        """
+        Places mines if this is the first move, then uncovers cell at `loc`.
+
+        If the cell at `loc` is already naked, solves its Block instead.
+        Then solves whatever that leads to.
+        """
+        self._drain(self.click_steps(loc))
+
+    def click_steps(self, loc: tuple[int, int]):
+        """Generator version of left_click(). See solve_steps()"""
+        if self.field[loc].is_flagged or self.game_over or self.win:
+            return
+
+        if self.is_new:
+            self.is_new = False
+            self.field.place_mines(loc, seed=self.seed)
+            if self.trace:
+                self.trace.record_board(self.field.encode())
+            for cell in self.field:
+                if self.field[cell].is_flagged:
+                    yield from self.flag_steps(cell)
+
+        if self.field[loc].is_naked:
+            yield from self._solve_block(loc, queue=NO_QUEUE)
+        else:
+            yield from self._uncover(loc)
+        yield from self.solve_steps()
@@ -0,0 +1,439 @@
+from bisect import bisect_left
+from collections import deque
+
+
+class Component:
+    """
+    An independent group of constraints along the frontier.
+
+    Each constraint is a naked Cell: exactly `required` of its unknown
+    neighbors are mined. Constraints sharing unknown Cells end up in the
+    same Component, and nothing outside the Component affects it,
+    so each Component can be solved on its own.
+
+    Attributes:
+
+        variables (`list`): Minefield indices of the unknown Cells.
+
+        constraints (`list`): `(required, members)` for each constraint, where
+                              `members` are positions in `variables`.
+
+        signature (`frozenset`): The constraints in terms of Minefield indices.
+                                 Components with the same signature are the same problem.
+
+    Methods:
+
+        solutions(assumptions): Generates every consistent mine layout.
+
+        solve(): Return positions which are safe and mined in every layout.
+
+        counts(): Relative number of layouts with each number of mines.
+
+        mine_odds(weights): Probability of each variable being mined.
+    """
+
+    def __init__(self, variables, constraints):
+        self.variables = variables
+        self.constraints = constraints
+        self.signature = frozenset((required, frozenset(variables[v] for v in members))
+                                   for required, members in constraints)
+
+        self._solved = None
+        self._layers = None
+
+        self._var_constraints = [[] for _ in variables]
+        for c, (required, members) in enumerate(constraints):
+            for v in members:
+                self._var_constraints[v].append(c)
+
+        self._order = self._search_order()
+
+    def __len__(self):
+        return len(self.variables)
+
+    def _search_order(self):
+        """Breadth-first through the constraints, so each guess is checked as early as possible."""
+        order = []
+        seen = [False] * len(self.variables)
+        for start in range(len(self.variables)):
+            if seen[start]:
+                continue
+            seen[start] = True
+            to_visit = deque([start])
+            while to_visit:
+                v = to_visit.popleft()
+                order.append(v)
+                for c in self._var_constraints[v]:
+                    for w in self.constraints[c][1]:
+                        if not seen[w]:
+                            seen[w] = True
+                            to_visit.append(w)
+        return order
+
+    def solutions(self, assumptions=()):
+        """
+        Generates every mine layout consistent with all constraints.
+
+        Backtracks through the variables, propagating every constraint
+        that becomes all-safe or all-mined after each guess, and abandons
+        a branch as soon as any constraint can no longer be met.
+
+        Args:
+            assumptions: `(position, value)` pairs fixed before searching.
+
+        Yields: `list` with 1 (mined) or 0 (safe) for each variable.
+                The same list is reused, copy it to keep it.
+        """
+        num_vars = len(self.variables)
+        assign = [-1] * num_vars
+        need = [required for required, members in self.constraints]
+        free = [len(members) for required, members in self.constraints]
+        trail = []
+        var_constraints = self._var_constraints
+        constraints = self.constraints
+
+        def set_var(v, value):
+            assign[v] = value
+            trail.append(v)
+            ok = True
+            for c in var_constraints[v]:
+                free[c] -= 1
+                need[c] -= value
+                if need[c] < 0 or need[c] > free[c]:
+                    ok = False
+            return ok
+
+        def undo(mark):
+            while len(trail) > mark:
+                v = trail.pop()
+                for c in var_constraints[v]:
+                    free[c] += 1
+                    need[c] += assign[v]
+                assign[v] = -1
+
+        def propagate(changed):
+            to_check = [c for v in changed for c in var_constraints[v]]
+            while to_check:
+                c = to_check.pop()
+                if not free[c] or 0 < need[c] < free[c]:
+                    continue
+                value = 1 if need[c] else 0
+                for v in constraints[c][1]:
+                    if assign[v] == -1:
+                        if not set_var(v, value):
+                            return False
+                        to_check.extend(var_constraints[v])
+            return True
+
+        def attempt(v, value):
+            return set_var(v, value) and propagate((v,))
+
+        for v, value in assumptions:
+            if assign[v] == -1:
+                if not attempt(v, value):
+                    return
+            elif assign[v] != value:
+                return
+        if not propagate(range(num_vars)):
+            return
+
+        order = self._order
+        branches = []
+        pos = 0
+        while True:
+            while pos < num_vars and assign[order[pos]] != -1:
+                pos += 1
+
+            if pos == num_vars:
+                yield assign
+                ok = False
+            else:
+                branches.append((pos, len(trail), 0))
+                ok = attempt(order[pos], 0)
+
+            while not ok:
+                if not branches:
+                    return
+                pos, mark, value = branches.pop()
+                undo(mark)
+                if value == 0:
+                    branches.append((pos, mark, 1))
+                    ok = attempt(order[pos], 1)
+
+    def solve(self):
+        """
+        Find the variables which are safe or mined in every layout.
+
+        Rather than enumerating every layout, looks for one layout with
+        each variable safe and one with it mined. Every layout found
+        witnesses all of its values at once, so few searches are needed.
+
+        The answer is kept, so solving the same Component again is free.
+
+        Returns: `tuple` of two sets of positions, `(safe, mined)`.
+        """
+        if self._solved is None:
+            self._solved = self._solve()
+        return self._solved
+
+    def _solve(self):
+        num_vars = len(self.variables)
+        seen_safe = [False] * num_vars
+        seen_mined = [False] * num_vars
+        known = []
+        safe = set()
+        mined = set()
+
+        def witness(layout):
+            for v, value in enumerate(layout):
+                if value:
+                    seen_mined[v] = True
+                else:
+                    seen_safe[v] = True
+
+        # No layout at all means a false flag somewhere. Nothing can be concluded.
+        layout = next(self.solutions(), None)
+        if layout is None:
+            return safe, mined
+        witness(layout)
+
+        for v in range(num_vars):
+            for value, seen, certain in ((0, seen_safe, mined), (1, seen_mined, safe)):
+                if seen[v] or v in safe or v in mined:
+                    continue
+                layout = next(self.solutions(known + [(v, value)]), None)
+                if layout is None:
+                    certain.add(v)
+                    known.append((v, 1 - value))
+                else:
+                    witness(layout)
+        return safe, mined
+
+    def _steps(self):
+        """
+        Plans the transitions used by counts() and mine_odds().
+
+        Variables are assigned in search order. Between assignments, the only
+        constraints that matter are the "open" ones: partly assigned, not yet
+        complete. Their remaining `need`s make up the state. For each
+        variable, returns `(carry, finish)`:
+            carry: `(previous index, required, contains variable, unassigned after)`
+                   for each constraint open after this variable.
+            finish: `(previous index, required)` for each constraint this
+                    variable completes.
+        A previous index of -1 means the constraint was not open yet.
+        """
+        num_vars = len(self.variables)
+        position = [0] * num_vars
+        for p, v in enumerate(self._order):
+            position[v] = p
+
+        member_positions = [sorted(position[v] for v in members) for required, members in self.constraints]
+        open_constraints = [[] for _ in range(num_vars + 1)]
+        for c, positions in enumerate(member_positions):
+            for boundary in range(positions[0] + 1, positions[-1] + 1):
+                open_constraints[boundary].append(c)
+
+        steps = []
+        for p, v in enumerate(self._order):
+            previous = {c: i for i, c in enumerate(open_constraints[p])}
+            contains = set(self._var_constraints[v])
+            carry = [(previous.get(c, -1), self.constraints[c][0], c in contains,
+                      len(member_positions[c]) - bisect_left(member_positions[c], p + 1))
+                     for c in open_constraints[p + 1]]
+            finish = [(previous.get(c, -1), self.constraints[c][0])
+                      for c in self._var_constraints[v] if member_positions[c][-1] == p]
+            steps.append((carry, finish))
+        return steps
+
+    @staticmethod
+    def _advance(state, value, carry, finish):
+        """Returns the state after assigning `value`, or None if that breaks a constraint."""
+        for previous, required in finish:
+            if (state[previous] if previous >= 0 else required) != value:
+                return None
+        new_state = []
+        for previous, required, contains, unassigned in carry:
+            need = (state[previous] if previous >= 0 else required) - (value if contains else 0)
+            if need < 0 or need > unassigned:
+                return None
+            new_state.append(need)
+        return tuple(new_state)
+
+    def _count(self):
+        """
+        Counts layouts by dynamic programming over the search order.
+
+        Each layer maps every reachable state to the relative number of ways
+        of reaching it with each number of mines. Layers are rescaled so their
+        largest entry is 1, and the scale factors kept, so nothing overflows.
+        Far fewer states than layouts, so long frontiers stay fast.
+        """
+        layers = [{(): {0: 1.0}}]
+        links = []
+        scales = []
+        for carry, finish in self._steps():
+            next_layer = {}
+            link = {}
+            for state, ways in layers[-1].items():
+                targets = (self._advance(state, 0, carry, finish), self._advance(state, 1, carry, finish))
+                link[state] = targets
+                for value, target in enumerate(targets):
+                    if target is None:
+                        continue
+                    target_ways = next_layer.setdefault(target, {})
+                    for mines, weight in ways.items():
+                        target_ways[mines + value] = target_ways.get(mines + value, 0.0) + weight
+            peak = max((weight for ways in next_layer.values() for weight in ways.values()), default=0.0)
+            if peak:
+                for ways in next_layer.values():
+                    for mines in ways:
+                        ways[mines] /= peak
+            layers.append(next_layer)
+            links.append(link)
+            scales.append(peak)
+        self._layers, self._links, self._scales = layers, links, scales
+
+    def counts(self) -> dict:
+        """
+        Relative number of layouts with each number of mines.
+
+        Computed once and kept, along with everything mine_odds() needs.
+
+        Returns: `dict` mapping number of mines to relative number of layouts.
+                 Empty if there is no layout at all.
+        """
+        if self._layers is None:
+            self._count()
+        return dict(self._layers[-1].get((), {}))
+
+    def mine_odds(self, weights: dict):
+        """
+        Probability of each variable being mined.
+
+        Works back through the layers kept by counts(), so each variable's
+        share of the weighted layouts comes out of a single pass.
+
+        Args:
+            weights: Relative weight of a layout with each number of mines.
+                     This is how the rest of the board is taken into account.
+
+        Returns: `list` of probabilities, one for each variable,
+                 or None if no layout has any weight.
+        """
+        if self._layers is None:
+            self._count()
+        layers, links, scales = self._layers, self._links, self._scales
+
+        odds = [0.0] * len(self.variables)
+        after = {(): {mines: weights.get(mines, 0.0) for mines in layers[-1].get((), {})}}
+        for p in reversed(range(len(self.variables))):
+            total = sum(weight * after[state][mines]
+                        for state, ways in layers[p + 1].items() for mines, weight in ways.items())
+            if not total:
+                return None
+
+            mined = 0.0
+            before = {}
+            for state, ways in layers[p].items():
+                safe_target, mined_target = links[p][state]
+                before_ways = {}
+                for mines, weight in ways.items():
+                    value = 0.0
+                    if safe_target is not None:
+                        value += after[safe_target].get(mines, 0.0)
+                    if mined_target is not None:
+                        with_mine = after[mined_target].get(mines + 1, 0.0)
+                        value += with_mine
+                        mined += weight * with_mine
+                    before_ways[mines] = value
+                before[state] = before_ways
+            odds[self._order[p]] = mined / scales[p] / total
+
+            peak = max((value for ways in before.values() for value in ways.values()), default=0.0)
+            if peak:
+                for ways in before.values():
+                    for mines in ways:
+                        ways[mines] /= peak
+            after = before
+        return odds
+
+
+class Frontier:
+    """
+    The boundary between naked and unknown Cells, split into Components.
+
+    Attributes:
+
+        field (`Minefield`): Reference to Minefield containing Cells.
+
+        components (`list`): Independent `Component`s along the frontier.
+
+        cache (`dict`): Components from earlier Frontiers, by signature.
+                        Any unchanged Component is reused, answers and all.
+
+    Methods:
+
+        solve(): Return coordinates of unknown Cells which are certainly
+                 safe and certainly mined.
+    """
+
+    def __init__(self, field, cache=None):
+        self.field = field
+        self.components = []
+        self.cache = {} if cache is None else cache
+
+        naked = field.naked
+        flagged = field.flagged
+        table = field.neighbor_table
+
+        # Group constraints by the unknown Cells they share.
+        constraints = {}
+        var_constraints = {}
+        for center in field.frontier():
+            unknowns = tuple(i for i in table[center] if not naked[i] and not flagged[i])
+            constraints[center] = unknowns
+            for i in unknowns:
+                var_constraints.setdefault(i, []).append(center)
+
+        seen = set()
+        for start in constraints:
+            if start in seen:
+                continue
+            seen.add(start)
+            group = []
+            to_visit = [start]
+            while to_visit:
+                center = to_visit.pop()
+                group.append(center)
+                for i in constraints[center]:
+                    for other in var_constraints[i]:
+                        if other not in seen:
+                            seen.add(other)
+                            to_visit.append(other)
+            self.components.append(self._build_component(group, constraints))
+
+    def _build_component(self, group, constraints):
+        field = self.field
+        positions = {}
+        component_constraints = []
+        for center in group:
+            required = field.surrounding_mines[center] - field.num_flagged_neighbors[center]
+            members = [positions.setdefault(i, len(positions)) for i in constraints[center]]
+            component_constraints.append((required, members))
+        component = Component(list(positions), component_constraints)
+        return self.cache.setdefault(component.signature, component)
+
+    def solve(self):
+        """
+        Solve every Component exactly.
+
+        Returns: `tuple` of two sets of coordinates, `(to_clear, to_flag)`.
+        """
+        to_clear = set()
+        to_flag = set()
+        for component in self.components:
+            safe, mined = component.solve()
+            to_clear.update(self.field.loc(component.variables[v]) for v in safe)
+            to_flag.update(self.field.loc(component.variables[v]) for v in mined)
+        return to_clear, to_flag
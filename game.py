@@ -1,110 +1,131 @@
+import time
 import tkinter
-from game_settings import pause, GAME_OVER_MSG, ALL_CLEAR_MSG
-from minefield import Minefield
-from cell import Cell
-from solving_queue import Queue, SuperQueue
-from neighborhood import Block, Neighborhood
+from board_view import LabelBoard, CanvasBoard, ViewportBoard
+from engine import Engine
+from game_settings import (COLORS, LABEL_BOARD_LIMIT, CELL_SIZE, VIEWPORT_SIZE, STATS_INTERVAL, STATS_PATH,
+                           PROFILE_PATH)
+from solver_stats import profile_call
+from solver_thread import BackgroundSolver
 
 
 class Game(tkinter.Frame):
     """
     Game object. Inherits from `tkinter.Frame`.
 
+    A thin view on top of a headless `Engine`. Draws the board, binds the
+    mouse buttons, and feeds the settings from the control panel into
+    the Engine. Also serves as the view of the
+    Engine's Minefield.
+
+    Drawing is coalesced: state changes, highlights and counters are only
+    noted as they happen, and applied in one batch once Tk is idle, which
+    is at the next `update()` (such as a showcase pause) or once the solver
+    hands control back to the event loop. A Cell highlighted several times
+    in between is only configured once, in its final state.
+
+    The solver never blocks the event loop. Clicks start one of the Engine's
+    step generators, which this drives with `after()`: straight through
+    for up to FRAME_TIME at a time, and waiting out the pause time of each
+    checked display setting instead of sleeping. So the window stays live,
+    and every setting can be changed mid-solve. Whenever a step is showcased,
+    the board scrolls to follow the active Cell, if it has moved out of view.
+
+    With "Solve in Background" checked, a click is solved at full speed on a
+    worker thread instead, with no highlights. The changes it publishes are
+    drawn every FRAME_INTERVAL, along with a live cells/sec readout.
+    With "Profile next solve" checked, the next click is solved the same
+    way, under cProfile, and the profile is written to PROFILE_PATH.
+
+    The Engine's counters and timers are shown in the Instruments panel,
+    refreshed every STATS_INTERVAL.
+
     Attributes:
 
-        field (`Minefield`): Minefield containing Cells indexed by `(x, y)` tuples.
+        engine (`Engine`): Holds the board state and all of the solving logic.
 
-        is_new (`bool`): If True, there are still no mines in the Minefield.
-                         Once the first Cell is uncovered, mines are placed
-                         and `is_new` is set to False.
+        field (`Minefield`): `Property`. The Engine's Minefield.
 
-        game_over (`bool`): If True, player lost (uncovered a mined cell)
-                            No more moves are allowed.
+        board (`LabelBoard`, `CanvasBoard` or `ViewportBoard`): Draws the Cells.
+                   A Canvas for boards with more than LABEL_BOARD_LIMIT cells,
+                   and a scrollable viewport for boards that won't fit in
+                   VIEWPORT_SIZE, unless `renderer` says otherwise.
 
-        win (`bool`): If True, player won (all un-mined cells are clear).
-                      No more moves are allowed.
+        status_label, mine_count_label, safe_count_label (`tkinter.Label`):
+            Access to the labels in the control panel.
 
-        mines_left (`int`): `Property`. Number of mines left to flag.
+        stats_panel (`StatsPanel`): Shows the Engine's counters and timers.
 
-        safes_left (`int`): `Property`. Number of safe cells left to clear.
+    Methods:
 
-        auto_solving (`tkinter.Checkbutton`): Access to `auto_solving`
-                                              checkbutton in the control panel.
+        redraw(loc), paint(loc, bg), highlight(loc), detonated():
+            Called by the Minefield to draw state changes and highlights.
 
-        direction (`tkinter.StringVar`): Access to `direction` variable
-                                         in the direction panel.
+        show_status(msg), show_mines_left(mines_left), show_safes_left(safes_left):
+            Called by the Engine whenever its status or counters change.
 
-        clear_queue (`SuperQueue`): Ordered list of covered cells in line
-                                    to be cleared.
+        flush(): Apply every pending change to the widgets.
 
-        auto_queue (`SuperQueue`): Ordered list of naked cells in line
-                                   for their neighbors to be analyzed and solved.
+        left_click(loc), right_click(loc): Start solving from a click at `loc`.
 
-        clear_queue (`SuperQueue`): Ordered list of cells which could not be solved
-                                    by analyzing their immediate Block.
-                                    Leftovers from the auto-queue.
+        drive(steps): Run the step generator `steps` from the event loop.
 
-        emphasis (`dict`): Provides access to the appropriate settings in the
-                           display panel (located in the control panel).
-                           These settings allow for the window to update highlights
-                            and pause for a few milliseconds with each execution
-                             of a procedure, thus showcasing the execution process.
+        resume_solving(): Carry on, unless paused.
 
-    Methods:
+        solve_in_background(action, *args): Run an Engine method on a worker thread.
 
-        uncover(loc): Uncovers cell at coordinates `loc`.
-                      Populates the appropriate Queue based on result and surroundings.
+        step_once(): Take a single step while paused.
 
-        toggle_flag(loc): Toggles flag at coordinates `loc`. Bound to right-click.
-                          Populates the `auto_queue` based on surroundings.
+        stop_solving(): Stop any solving, in the background or not.
 
-        solve_block(center_cell): Takes action based on `center_cell`'s neighbors.
+        reset(width, height, percent_mined, renderer): Start a new game, reusing the board.
 
-        process(queue): Passes each value in `queue` to the appropriate method.
-                        Adds emphasis and loops until `queue` is empty.
-
-        left_click(loc): Bound to left-click button for each Cell.
+        dump_stats(path): Write the Engine's counters and timers to `path`, as JSON.
     """
 
-    def __init__(self, control_panel, width, height, percent_mined):
-        """`control_panel` passes a reference to the control panel in the main window."""
+    # Longest the solver runs before letting the event loop catch up, in seconds.
+    FRAME_TIME = 0.02
 
-        super().__init__()
+    # Time between redraws while solving in the background, in milliseconds.
+    FRAME_INTERVAL = 33
 
-        # The following lines prevent an infinite loop at mine placement
-        #  if percent_mined is set too high.
-        total_cells = width * height
-        total_mines_allowed = total_cells - 9
-        total_mines_requested = round(total_cells * percent_mined / 100)
+    def __init__(self, control_panel, width, height, percent_mined, renderer=None):
+        """
+        `control_panel` passes a reference to the control panel in the main window.
 
-        total_mines = min(total_mines_requested, total_mines_allowed)
+        `renderer` is "labels", "canvas" or "viewport". By default, picked by board size.
+        """
 
-        self.field = Minefield(total_mines)
+        super().__init__()
 
-        self.is_new = True
-        self.game_over = False
-        self.win = False
+        # Pending changes, applied by flush().
+        #  `_pending` maps each location to whether it needs a redraw,
+        #  and the highlight to paint over it, if any.
+        self._pending = {}
+        self._labels = {}
+        self._detonated = False
+        self._flush_id = None
+        # Latest Cell highlighted as active, for the board to follow.
+        self._active = None
+
+        # Step generators in progress, newest last, and the next call to advance them.
+        self._drivers = []
+        self._advance_id = None
+        self.paused = control_panel.display_panel.paused
+
+        self.background_solving = control_panel.background_solving
+        self.rate_label = control_panel.rate_label
+        self._solver = None
+        self._poll_id = None
+        self._profile_path = None
+
+        self.stats_panel = control_panel.stats_panel
+        self._stats_id = None
 
         self.status_label = control_panel.status_label
-
         self.mine_count_label = control_panel.mine_count_label
-        self._mines_left = 0
-        self.mines_left = total_mines
-
         self.safe_count_label = control_panel.safe_count_label
-        self._safes_left = 0
-        self.safes_left = (width * height) - total_mines
 
-        self.auto_solving = control_panel.auto_solving
-        self.hyper_solving = control_panel.hyper_solving
-        self.direction = control_panel.direction_panel.direction
-
-        # self.flag_queue = SuperQueue(self.field, color="to_flag", direction_var=self.direction)
-        self.clear_queue = SuperQueue(self.field, color="clear_queue", direction_var=self.direction)
-        self.auto_queue = SuperQueue(self.field, color="auto_queue", direction_var=self.direction)
-        self.hyper_queue = SuperQueue(self.field, color="hyper_queue", direction_var=self.direction)
-
-        self.emphasis = {
+        emphasis = {
             "clear_queue": control_panel.display_panel.clear_queue_settings,
             "auto_queue": control_panel.display_panel.auto_queue_settings,
             "add_batch": control_panel.display_panel.add_batch_settings,
@@ -113,291 +134,269 @@ class Game(tkinter.Frame):
             "hyper_queue": control_panel.display_panel.hyper_queue_settings,
         }
 
-        # Create cells
-        for x in range(width):
-            for y in range(height):
-                self.field[x, y] = Cell(master=self)
-                self.field[x, y].grid(row=y, column=x)
-                self.field[x, y].bind("<Button-1>",
-                                      lambda event, loc=(x, y): self.left_click(loc))
-                self.field[x, y].bind("<Button-3>",
-                                      lambda event, loc=(x, y): self.toggle_flag(loc, auto_flag=False))
-
-    @property
-    def mines_left(self):
-        return self._mines_left
+        self.engine = Engine(width=width, height=height, percent_mined=percent_mined,
+                             auto_solving=control_panel.auto_solving,
+                             hyper_solving=control_panel.hyper_solving,
+                             frontier_solving=control_panel.frontier_solving,
+                             guessing=control_panel.guessing,
+                             direction=control_panel.direction_panel.direction,
+                             emphasis=emphasis,
+                             view=self)
+
+        self.board = None
+        self._build_board(width, height, renderer)
+        self.engine.field.view = self
+        self._refresh_stats()
+
+    @staticmethod
+    def pick_renderer(width, height):
+        """Renderer for a `width` x `height` board: "labels", "canvas" or "viewport"."""
+        if width * CELL_SIZE > VIEWPORT_SIZE[0] or height * CELL_SIZE > VIEWPORT_SIZE[1]:
+            return "viewport"
+        if width * height > LABEL_BOARD_LIMIT:
+            return "canvas"
+        return "labels"
+
+    def _build_board(self, width, height, renderer=None):
+        """Replace the board with a new one, unless it is already drawn by `renderer`."""
+        board_class = {"labels": LabelBoard, "canvas": CanvasBoard, "viewport": ViewportBoard}[
+            renderer or self.pick_renderer(width, height)]
+        if type(self.board) is board_class:
+            self.board.reset(width, height)
+            return
 
-    @mines_left.setter
-    def mines_left(self, mines_left):
-        self._mines_left = mines_left
-        self.mine_count_label.config(text=mines_left)
+        if self.board is not None:
+            self.board.destroy()
+        if board_class is ViewportBoard:
+            self.board = ViewportBoard(self, self.engine.field,
+                                       on_left_click=self.left_click,
+                                       on_right_click=self.right_click)
+        else:
+            self.board = board_class(self, width, height,
+                                     on_left_click=self.left_click,
+                                     on_right_click=self.right_click)
+        self.board.grid(row=0, column=0)
 
-    @property
-    def safes_left(self):
-        return self._safes_left
-
-    @safes_left.setter
-    def safes_left(self, safes_left):
-        self._safes_left = safes_left
-        self.safe_count_label.config(text=safes_left)
-
-    def _auto_spark(self):
-        """Kick-starts all queues processing if it's not already busy."""
-        clear_busy = self.clear_queue.is_busy
-        auto_busy = self.auto_queue.is_busy
-        hyper_busy = self.hyper_queue.is_busy
-
-        if self.clear_queue and not clear_busy:
-            self.clear_queue.is_busy = True
-            self.process(self.clear_queue)
-        elif self.auto_queue and not clear_busy and not auto_busy:
-            self.auto_queue.is_busy = True
-            self.process(self.auto_queue)
-        elif self.hyper_queue and not clear_busy and not auto_busy and not hyper_busy:
-            self.hyper_queue.is_busy = True
-            self.process(self.hyper_queue)
-
-    def uncover(self, loc: tuple[int, int]) -> None:
+    def reset(self, width, height, percent_mined, renderer=None):
         """
-        Uncovers cell at coordinates `loc`.
-
-        If the now naked (and hopefully un-mined) cell has no mined neighbors,
-        add all its uncovered neighbors to the `clear_queue`.
+        Start a new game on a `width` x `height` board, in place.
 
-        If it does have mined neighbors, and if `auto_solving` is checked,
-        add the cell's coordinates to the `auto_queue`.
+        Stops any solving, then resets the Engine, its Minefield and queues.
+        The board is kept, and only resized where the size changed,
+        unless the new size calls for a different renderer.
         """
-        if loc in self.clear_queue:
-            self.clear_queue.remove(loc)
+        self.stop_solving()
+        self._pending = {}
+        self._labels = {}
+        self._detonated = False
+        self._active = None
+        self.engine.reset(width, height, percent_mined)
+        self._build_board(width, height, renderer)
 
-        if self.field[loc].is_naked:
-            print("Clear naked")
+    @property
+    def field(self):
+        return self.engine.field
+
+    def _schedule(self):
+        if self._flush_id is None:
+            self._flush_id = self.after_idle(self.flush)
+
+    def redraw(self, loc):
+        # Drawing resets the highlight, so any earlier one is dropped.
+        if not self.board.in_view(loc):
+            # Nothing to draw; the board is drawn from the Minefield once scrolled to.
+            self._pending.pop(loc, None)
+            self.board.forget(loc)
             return
+        self._pending[loc] = True, None
+        self._schedule()
+
+    def detonated(self):
+        self._detonated = True
+        self._schedule()
+
+    def paint(self, loc, bg):
+        if bg == "active_cell":
+            self._active = loc
+        if bg in COLORS:
+            needs_redraw = self._pending.get(loc, (False, None))[0]
+            self._pending[loc] = needs_redraw, bg
+            self._schedule()
+
+    def highlight(self, loc):
+        bg = self._pending.get(loc, (False, None))[1]
+        return bg or self.board.bg(loc)
+
+    def show_status(self, msg):
+        self._labels[self.status_label] = msg
+        self._schedule()
+
+    def show_mines_left(self, mines_left):
+        self._labels[self.mine_count_label] = mines_left
+        self._schedule()
+
+    def show_safes_left(self, safes_left):
+        self._labels[self.safe_count_label] = safes_left
+        self._schedule()
+
+    def flush(self):
+        """Apply every pending change to the widgets."""
+        self._flush_id = None
+        pending, self._pending = self._pending, {}
+        labels, self._labels = self._labels, {}
+
+        field = self.field
+        board = self.board
+        if self._detonated:
+            self._detonated = False
+            board.detonate(field)
+        for loc, (needs_redraw, bg) in pending.items():
+            if needs_redraw:
+                board.draw(loc, field[loc], detonated=field.detonated)
+            if bg:
+                board.paint(loc, bg)
+        for label, text in labels.items():
+            label.config(text=text)
+
+    def _showcase(self):
+        """Flush, and bring the active Cell into view."""
+        self.flush()
+        if self._active is not None:
+            self.board.follow(self._active)
+            self._active = None
+
+    def _refresh_stats(self):
+        self.stats_panel.show(self.engine.stats.snapshot())
+        self._stats_id = self.after(STATS_INTERVAL, self._refresh_stats)
+
+    def dump_stats(self, path=STATS_PATH):
+        """Write the Engine's counters and timers to `path`, as JSON."""
+        self.engine.stats.dump(path)
+        self.stats_panel.note_label.config(text="Stats written to {}".format(path))
+
+    def left_click(self, loc):
+        if self._solver:
+            return
+        if self.stats_panel.profile_next.get() and not self._drivers:
+            self.stats_panel.profile_next.set(False)
+            self._profile_path = PROFILE_PATH
+            self.solve_in_background(profile_call, PROFILE_PATH, self.engine.left_click, loc)
+        elif self.background_solving.get() and not self._drivers:
+            self.solve_in_background(self.engine.left_click, loc)
+        else:
+            self.drive(self.engine.click_steps(loc))
 
-        self.field.uncover(loc)
-
-        if self.field.is_triggered():
-            self.game_over = True
-            [queue.clear() for queue in
-             (self.clear_queue, self.auto_queue, self.hyper_queue)]
-            self.status_label.config(text=GAME_OVER_MSG)
+    def right_click(self, loc):
+        if self._solver:
             return
+        if self.background_solving.get() and not self._drivers:
+            self.solve_in_background(self.engine.toggle_flag, loc, False)
+        else:
+            self.drive(self.engine.flag_steps(loc, auto_flag=False))
 
-        self.safes_left -= 1
-
-        if self.field.is_all_clear():
-            self.win = True
-            self.status_label.config(text=ALL_CLEAR_MSG)
-
-        if loc in self.clear_queue:
-            self.clear_queue.remove(loc)
-
-        if self.field[loc].surrounding_mines == 0:
-            block = Block(self.field, loc)
-            self.clear_queue.add_batch(block.unknown_neighbors,
-                                       emphasis=self.emphasis["add_batch"],
-                                       color="new_clear")
-        elif self.auto_solving.get():
-            block = Block(self.field, loc)
-            useful_neighbors = block.naked_neighbors
-            useful_neighbors.add(loc)
-            [self.hyper_queue.remove(cell) for cell in useful_neighbors]
-            self.auto_queue.add_batch(useful_neighbors,
-                                      emphasis=self.emphasis["add_batch"],
-                                      color="new_auto")
-            self.auto_queue.clean_up(emphasis=self.emphasis["redundant"])
-            self.hyper_queue.clean_up(emphasis=self.emphasis["redundant"])
-
-        self._auto_spark()
-
-    def toggle_flag(self, loc: tuple[int, int], auto_flag=True) -> None:
+    def solve_in_background(self, action, *args):
         """
-        Toggle flag at location `loc`.
-
-        If cell at `loc` has any useful neighbors, adds them to the `auto_queue`.
-        This method is bound to the right click button for each cell.
+        Run Engine method `action` with `args` on a worker thread, at full speed.
+        See BackgroundSolver. Board changes are drawn every FRAME_INTERVAL.
         """
-        if self.game_over or self.field[loc].is_naked:
-            return
-
-        if self.field[loc].is_flagged:
-            print("UNFLAGGING")
-            self.field[loc].un_flag()
-            self.mines_left += 1
+        self.flush()
+        self._solver = BackgroundSolver(self.engine, action, *args)
+        self._solver.start()
+        self._poll_id = self.after(self.FRAME_INTERVAL, self._poll)
+
+    def _poll(self):
+        solver = self._solver
+        is_done = solver.is_done()
+        locs, counters = solver.drain()
+        for loc in locs:
+            self.redraw(loc)
+        if counters.pop("detonated", False):
+            self.detonated()
+        for name, value in counters.items():
+            getattr(self, "show_" + name)(value)
+        self.rate_label.config(text="{:,.0f} cells/sec".format(solver.cells_per_second()))
+
+        if is_done:
+            solver.finish()
+            self._solver = None
+            self._poll_id = None
+            if self._profile_path:
+                self.stats_panel.note_label.config(text="Profile written to {}".format(self._profile_path))
+                self._profile_path = None
         else:
-            self.field[loc].flag()
-            self.mines_left -= 1
-
-        if self.auto_solving.get():
-            block = Block(self.field, loc)
-            useful_neighbors = {neighbor for neighbor in block.naked_neighbors
-                                if Block(self.field, neighbor).unknown_neighbors}
-            [self.hyper_queue.remove(cell) for cell in useful_neighbors]
-            self.auto_queue.add_batch(useful_neighbors,
-                                      emphasis=self.emphasis["add_batch"],
-                                      color="new_auto")
-        if not auto_flag:
-            self._auto_spark()
-
-    def solve_block(self, center_cell: tuple[int, int]):
-        """
-        Creates a Block around `center_cell` and calls that Block's
-         solve() method.
-
-        If the Block's solve() method returns "clear",
-         uncovers unknown neighbors.
+            self._poll_id = self.after(self.FRAME_INTERVAL, self._poll)
+        self.flush()
 
-        If the Block's solve() method returns "flag",
-         flags unknown neighbors.
-
-        If the Block's solve() method does not reach a clear decision,
-         passes the `center_cell` coordinates to the `hyper_queue`
+    def drive(self, steps):
+        """
+        Run the step generator `steps` from the event loop. See Engine.solve_steps()
 
-        Args:
-            center_cell: `tuple`. Coordinates.
+        Takes priority over any already running, which carry on once it is done.
         """
-        block = Block(self.field, center_cell)
-        action = block.solve()
-        if action == 'clear':
-            self.clear_queue.add_batch(block.unknown_neighbors,
-                                       emphasis=self.emphasis["add_batch"],
-                                       color="new_clear")
-            if not self.clear_queue.is_busy:
-                self.clear_queue.is_busy = True
-                self.process(self.clear_queue)
-        elif action == 'flag':
-            to_flag = Queue(field=self.field, color="to_flag")
-            for cell in block.unknown_neighbors:
-                to_flag.append(cell)
-            to_flag.direction = self.direction
-            to_flag.re_orient()
-            if self.emphasis["to_flag"].is_checked:
-                self.update()
-                pause(self.emphasis["to_flag"].pause_time)
-            while to_flag:
-                new_flag = to_flag[0]
-                to_flag.remove(new_flag)
-                self.toggle_flag(new_flag)
-        elif self.hyper_solving.get() and center_cell not in self.hyper_queue:
-            self.hyper_queue.append(center_cell)
-            for neighbor in block.naked_neighbors:
-                if neighbor in self.hyper_queue or neighbor in self.auto_queue:
-                    continue
-                neighbor_block = Block(self.field, neighbor)
-                if neighbor_block.unknown_neighbors:
-                    self.hyper_queue.append(neighbor)
-        self._auto_spark()
-
-    def solve_neighborhood(self, cell_a, cell_b):
-        self.field[cell_a].bg = "naked"
-        self.field[cell_b].bg = "hyper_queue"
-        clear_set, flag_set = Neighborhood(self.field, cell_a, cell_b).solve()
-        # for cell in flag_set:
-        #     if self.field[cell].is_flagged:
-        #         print("to_flag from solve_neighborhood (before add_batch to clear_queue)")
-        if clear_set:
-            self.clear_queue.add_batch(clear_set,
-                                       emphasis=self.emphasis["add_batch"],
-                                       color="new_clear")
-        if flag_set:
-            to_flag = Queue(field=self.field, color="to_flag")
-            for cell in flag_set:
-                # if self.field[cell].is_flagged:
-                #     print("to_flag from solve_neighborhood (after add_batch to clear_queue)")
-                to_flag.append(cell)
-            to_flag.direction = self.direction
-            to_flag.re_orient()
-            if self.emphasis["to_flag"].is_checked:
-                self.update()
-                pause(self.emphasis["to_flag"].pause_time)
-            while to_flag:
-                new_flag = to_flag[0]
-                if self.field[new_flag].is_flagged:
-                    print("new_flag from solve_neighborhood")
-                to_flag.remove(new_flag)
-                self.toggle_flag(new_flag)
-        self._auto_spark()
-
-    def process(self, queue: SuperQueue):
+        self._drivers.append(steps)
+        self.resume_solving()
+
+    def resume_solving(self):
+        """Carry on with any steps left, unless paused."""
+        if self._drivers and self._advance_id is None and not self.paused.get():
+            self._advance_id = self.after_idle(self._advance)
+
+    def step_once(self):
+        """Take a single step, up to the next thing to showcase. Meant for while paused."""
+        if self._advance_id is not None:
+            self.after_cancel(self._advance_id)
+            self._advance_id = None
+        self._next_step()
+        self._showcase()
+        self.resume_solving()
+
+    def _next_step(self):
         """
-        Passes each value in `queue` to the appropriate method.
-        Adds emphasis and loops until `queue` is empty.
+        Advance the newest step generator to its next showcase.
 
-        If `queue` being processed is the `clear_queue`,
-         passes values to the `uncover` method.
-
-        If `queue` being processed is the `auto_queue`,
-         passes values to the `solve_block` method.
-
-        If `queue` being processed is the `hyper_queue`,
-         passes values to the `solve_block` method
-         with `first_round` set to False. (for now...)
-
-        Args:
-            queue: `SuperQueue` to process.
-                    Can be `clear_queue`, `auto_queue`, or `hyper_queue`
+        Returns: The display settings to showcase, or None once every generator is done.
         """
-
-        def apply_emphasis(queue_name):
-            if self.emphasis[queue_name].is_checked:
-                self.update()
-                pause(self.emphasis[queue_name].pause_time)
-
-        while queue:
-            queue.re_orient()
-
-            if self.direction.get() == "FIFO":
-                next_cell = queue[0]
-            else:
-                next_cell = queue[-1]
-
-            self.field[next_cell].bg = "active_cell"
-
-            if queue == self.clear_queue:
-                apply_emphasis("clear_queue")
-                self.uncover(next_cell)
-
-            elif queue == self.auto_queue:
-                apply_emphasis("auto_queue")
-                queue.remove(next_cell)
-                self.solve_block(next_cell)
-
-            elif queue == self.hyper_queue:
-                # apply_emphasis("hyper_queue")
-                queue.remove(next_cell)
-                # self.solve_block(next_cell, first_round=False)
-                block_a = Block(self.field, next_cell)
-                unknowns_a = block_a.unknown_neighbors
-
-                for cell_b in queue[::-1]:
-                    block_b = Block(self.field, cell_b)
-                    unknowns_b = block_b.unknown_neighbors
-                    if unknowns_a & unknowns_b and unknowns_a.symmetric_difference(unknowns_b):
-                        self.field[next_cell].bg = "active_cell"
-                        self.field[cell_b].bg = "neighbor_cell"
-                        apply_emphasis("hyper_queue")
-                        self.solve_neighborhood(next_cell, cell_b)
-
-        queue.is_busy = False
-        self._auto_spark()
-
-    def left_click(self, loc: tuple[int, int]):
-        """Bound to left-click button for each Cell."""
-        if self.field[loc].is_flagged or self.game_over or self.win:
-            return
-
-        if self.is_new:
-            self.is_new = False
-            self.field.place_mines(loc)
-            for cell in self.field:
-                if self.field[cell].is_flagged:
-                    self.toggle_flag(cell)
-
-        if self.field[loc].is_naked:
-            self.solve_block(loc)
-        else:
-            self.uncover(loc)
-
-        #
-        # if self.auto_solving.get():
-        #     self._auto_spark()
+        while self._drivers:
+            try:
+                name = next(self._drivers[-1])
+            except StopIteration:
+                self._drivers.pop()
+                continue
+            return self.engine.emphasis[name]
+        return None
+
+    def _advance(self):
+        self._advance_id = None
+        deadline = time.perf_counter() + self.FRAME_TIME
+        while not self.paused.get():
+            settings = self._next_step()
+            if settings is None:
+                return
+            if settings.is_checked:
+                self._showcase()
+                self._advance_id = self.after(int(float(settings.pause_time)), self._advance)
+                return
+            if time.perf_counter() > deadline:
+                self._advance_id = self.after(1, self._advance)
+                return
+
+    def stop_solving(self):
+        """Stop any solving, in the background or not, and cancel every pending callback."""
+        if self._solver:
+            self.engine.stop()
+            self._solver.finish()
+            self._solver = None
+        for after_id in (self._flush_id, self._advance_id, self._poll_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._flush_id = self._advance_id = self._poll_id = None
+        for steps in self._drivers:
+            steps.close()
+        self._drivers = []
+
+    def destroy(self):
+        self.stop_solving()
+        if self._stats_id is not None:
+            self.after_cancel(self._stats_id)
+            self._stats_id = None
+        super().destroy()
@@ -1,16 +1,30 @@
-import time
+class Setting:
+    """
+    Stand-in for a tkinter variable, so the solver can run without a display.
+
+    Offers the same `get()` and `set()` methods as `tkinter.BooleanVar`
+    and `tkinter.StringVar`.
+    """
+
+    def __init__(self, value=None):
+        self._value = value
 
+    def get(self):
+        return self._value
 
-def pause(pause_time):
+    def set(self, value):
+        self._value = value
+
+
+class Emphasis:
     """
-    If pause_time is more than zero, calls built-in time.sleep.
+    Stand-in for `DisplaySettings`, so the solver can run without a display.
 
-    Args:
-        pause_time: Time to pause at each step, in milliseconds.
+    Never checked, so nothing is ever showcased.
     """
-    ms = int(pause_time)
-    if ms > 0:
-        time.sleep(ms/1000)
+
+    is_checked = False
+    pause_time = 0
 
 
 # Default Game parameters.
@@ -18,6 +32,34 @@ MAP_WIDTH = 40
 MAP_HEIGHT = 24
 PERCENT_MINED = 19
 
+# Finished games are kept here. See results.py
+RESULTS_DB = "results.db"
+
+# Boards with more cells than this are drawn on a single Canvas
+#  instead of with one Label per cell. See board_view.py
+#  Expert (30x16) still gets Labels; the default 40x24 is already slow with them.
+LABEL_BOARD_LIMIT = 480
+
+# Size of each cell on a Canvas board, in pixels.
+CELL_SIZE = 20
+
+# Boards too big to show at CELL_SIZE in this many pixels are shown through
+#  a scrollable viewport instead, which only draws the cells in view.
+VIEWPORT_SIZE = (1200, 800)
+
+# Cells drawn around the viewport on each side, so short scrolls need no redraw.
+VIEWPORT_MARGIN = 10
+
+# Time between refreshes of the Instruments panel, in milliseconds,
+#  and where its JSON dumps and cProfile captures are written.
+STATS_INTERVAL = 500
+STATS_PATH = "solver_stats.json"
+PROFILE_PATH = "solve.prof"
+
+# Largest side of the minimap, in pixels, and time between refreshes, in milliseconds.
+MINIMAP_SIZE = 200
+MINIMAP_INTERVAL = 500
+
 
 ACTIVE_FIELD_MSG = "There are still cells to clear..."
 GAME_OVER_MSG = "!!!!!*****BOOM*****!!!!!"
@@ -1,100 +1,532 @@
 import random
-from neighborhood import Block
+import struct
+from itertools import compress
+from cell import Cell
+from neighborhood import Block, neighbor_table
 
 
-class Minefield(dict):
+# Maps a byte of 0 to 1 and anything else to 0.
+_IS_ZERO = bytes([1]) + bytes(255)
+
+# Maps a byte of 0 to 0 and anything else to 1.
+_IS_NONZERO = bytes([0]) + bytes([1]) * 255
+
+# Maps bytes of 0 and 1 to the digits "0" and "1", and back.
+_TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+_FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+# Header of an encoded board: magic, version, flags, width, height, total mines,
+#  seed, first step x and y. Followed by the packed mine layout.
+BOARD_MAGIC = b'MSWP'
+BOARD_VERSION = 1
+BOARD_HEADER = struct.Struct('<4sBBIIIQII')
+_HAS_SEED = 1
+_HAS_FIRST_STEP = 2
+
+
+class Minefield:
     """
-    A dictionary to hold the Cell objects indexed by x, y coordinates.
+    The board state, held in flat byte arrays indexed by `x * height + y`.
+
+    Acts like a dictionary of Cell objects indexed by x, y coordinates,
+    so `field[x, y]`, `loc in field`, `len(field)`, `items()` and `values()`
+    all still work. The Cells it hands out are lightweight views
+    onto the arrays.
 
     Attributes:
 
+        width (`int`), height (`int`): Dimensions of the Minefield.
+
         total_mines (`int`): Total number of mines to be placed in Minefield.
 
+        mined (`bytearray`): 1 for each mined cell, else 0.
+
+        naked (`bytearray`): 1 for each uncovered cell, else 0.
+
+        flagged (`bytearray`): 1 for each flagged cell, else 0.
+
+        surrounding_mines (`bytearray`): number of mined neighbors of each cell.
+
+        num_flagged_neighbors (`bytearray`): number of flagged neighbors of each cell.
+
+        num_unknown_neighbors (`bytearray`): number of neighbors of each cell which
+                                             are neither naked nor flagged.
+
+        Both neighbor counts are kept up to date by uncover(), flag() and un_flag().
+
+        num_naked_safe (`int`): number of un-mined cells uncovered so far.
+
+        triggered (`bool`): True once a mined cell has been uncovered.
+
+        seed (`int`): Seed used to place the mines, once they are placed.
+
+        first_step (`tuple`): Coordinates of the first uncovered Cell, once mines are placed.
+
+        neighbor_table (`NeighborTable`): `Property`. Neighbor indices of every cell.
+                                          Shared by every Minefield of the same size.
+
+        detonated (`bool`): True once the mistakes have been shown.
+
+        blocks_built (`int`): Number of Blocks built on this Minefield, across resets.
+
+        view: Displays the Minefield. Needs `redraw(loc)`, `paint(loc, bg)`,
+              `highlight(loc)`, `update()` and `detonated()`. None when headless.
+
     Methods:
 
-        place_mines(first_step): Place mines randomly in Minefield, avoiding
+        index(loc): Index of coordinates `loc` in the arrays.
+
+        loc(index): Coordinates of `index` in the arrays.
+
+        set_mine(loc): Set a single mine and let the neighbors know.
+
+        set_mines(mines): Set many mines, then count all neighbors at once.
+
+        place_mines(first_step, seed): Place mines randomly in Minefield, avoiding
                                  the Cell at `first_step` and its neighbors.
 
+        packed_mines(): The mine layout, one bit per Cell.
+
+        unpack_mines(data): Set every mine in a layout from packed_mines().
+
+        encode(): The board as compact bytes: dimensions, mines, seed and first step.
+
+        restore(data): Set the mines, seed and first step from encode().
+
+        reset(width, height, total_mines): Start over on a blank board, reusing the arrays.
+
+        decode(data): `classmethod`. New Minefield from encode().
+
+        save(path), load(path): Write to or read from a file, with encode() and decode().
+
+        has_unknown_neighbors(loc): Return True if any neighbor of `loc` is unknown.
+
+        frontier(): Indices of naked Cells with at least one unknown neighbor.
+
+        frontier_mask(): 1 for each of those Cells, else 0, in index order.
+
+        unknown(): Indices of Cells neither naked nor flagged.
+
         uncover(loc): Uncover Cell with x, y coordinates `loc`.
 
+        open_region(loc): Uncover the whole opening around the zero Cell at `loc`.
+
+        flag(loc), un_flag(loc): Flag or un-flag Cell at `loc`.
+
         is_all_clear(): Return True if player wins.
 
         is_triggered(): Return True if player steps on mine.
 
-        detonate(): Call each Cell object's show_mistakes() method.
+        detonate(): Show all mistakes.
     """
 
-    def __init__(self, total_mines):
-        super().__init__()
+    def __init__(self, width, height, total_mines):
+        self.width = width
+        self.height = height
         self.total_mines = total_mines
 
+        size = width * height
+        self.mined = bytearray(size)
+        self.naked = bytearray(size)
+        self.flagged = bytearray(size)
+        self.surrounding_mines = bytearray(size)
+
+        # Every neighbor starts out unknown.
+        starts = self.neighbor_table.starts
+        self.num_flagged_neighbors = bytearray(size)
+        self.num_unknown_neighbors = bytearray(end - start for start, end in zip(starts, starts[1:]))
+
+        self.num_naked_safe = 0
+        self.triggered = False
+
+        self.seed = None
+        self.first_step = None
+
+        self.detonated = False
+        self.blocks_built = 0
+        self.view = None
+
+    def reset(self, width, height, total_mines):
+        """
+        Start over with every Cell covered and no mines, on a `width` x `height` board.
+
+        The arrays are cleared or resized in place, so anything holding on
+        to this Minefield, such as a view, carries on with the new board.
+        """
+        self.width = width
+        self.height = height
+        self.total_mines = total_mines
+
+        size = width * height
+        blank = bytes(size)
+        for cells in (self.mined, self.naked, self.flagged, self.surrounding_mines, self.num_flagged_neighbors):
+            cells[:] = blank
+        # Every neighbor starts out unknown.
+        self.num_unknown_neighbors[:] = self._neighbor_sums(b'\x01' * size).to_bytes(size, 'little')
+
+        self.num_naked_safe = 0
+        self.triggered = False
+        self.seed = None
+        self.first_step = None
+        self.detonated = False
+
+    def index(self, loc: tuple[int, int]) -> int:
+        """Index of coordinates `loc` in the arrays."""
+        return loc[0] * self.height + loc[1]
+
+    @property
+    def neighbor_table(self):
+        """Shared NeighborTable for this board size."""
+        return neighbor_table(self.width, self.height)
+
+    def loc(self, index: int) -> tuple[int, int]:
+        """Coordinates of `index` in the arrays."""
+        return divmod(index, self.height)
+
+    def __getitem__(self, loc):
+        if loc not in self:
+            raise KeyError(loc)
+        return Cell(self, loc)
+
+    def __contains__(self, loc):
+        x, y = loc
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __iter__(self):
+        for x in range(self.width):
+            for y in range(self.height):
+                yield x, y
+
+    def __len__(self):
+        return self.width * self.height
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (Cell(self, loc) for loc in self)
+
+    def items(self):
+        return ((loc, Cell(self, loc)) for loc in self)
+
+    def _redraw(self, loc):
+        if self.view:
+            self.view.redraw(loc)
+
     def set_mine(self, loc):
         """Sets a mine at location `loc` and lets the neighbors know."""
-        self[loc].is_mined = True
-        for neighbor in Block(self, loc):
-            self[neighbor].surrounding_mines += 1
+        i = self.index(loc)
+        self.mined[i] = 1
+        for neighbor in self.neighbor_table[i]:
+            self.surrounding_mines[neighbor] += 1
+
+    def set_mines(self, mines):
+        """Sets a mine at every location in `mines`, then counts all neighbors in one pass."""
+        for loc in mines:
+            self.mined[self.index(loc)] = 1
+        self._count_surrounding_mines()
+
+    def _neighbor_sums(self, mask) -> int:
+        """
+        Sum `mask` over the neighbors of every cell with a 3x3 convolution.
+
+        Each byte of `mask` (all 0 or 1) becomes one 8-bit lane of a big integer.
+        Shifting by one byte moves every lane one cell along y, shifting by
+        `height` bytes moves it one cell along x. No sum exceeds 8, so lanes
+        never carry into each other and a handful of big integer operations
+        cover the whole board at once.
 
-    def place_mines(self, first_step: tuple[int, int]):
+        Returns: the sums as a big integer, one lane per cell.
+        """
+        width, height = self.width, self.height
+        size = width * height
+
+        cells = int.from_bytes(mask, 'little')
+        not_first_y = int.from_bytes((b'\x00' + b'\xff' * (height - 1)) * width, 'little')
+        not_last_y = int.from_bytes((b'\xff' * (height - 1) + b'\x00') * width, 'little')
+        whole_board = (1 << (8 * size)) - 1
+
+        column = cells + ((cells << 8) & not_first_y) + ((cells >> 8) & not_last_y)
+        shift = 8 * height
+        block = column + ((column << shift) & whole_board) + (column >> shift)
+
+        return block - cells
+
+    def _count_surrounding_mines(self):
+        """Rebuild `surrounding_mines` from `mined`."""
+        size = len(self)
+        if not size:
+            return
+        self.surrounding_mines = bytearray(self._neighbor_sums(self.mined).to_bytes(size, 'little'))
+
+    def place_mines(self, first_step: tuple[int, int], seed=None):
         """
         Place mines in random Cells in Minefield.
 
+        Any Cells flagged beforehand are mined first. Then the remaining
+        mines are drawn in a single pass from every Cell still eligible.
+
         Args:
             first_step: Coordinates `(x, y)` of first uncovered Cell.
                         No mines will be placed in this Cell or in any
                         of its neighbors.
+            seed: Seed for the random number generator, so the placement
+                  can be reproduced. If None, one is drawn at random.
+                  Either way, it is kept as `seed`.
         """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.first_step = first_step
+        rng = random.Random(seed)
+
         mines_to_be_placed = self.total_mines
 
         leave_clear = {first_step}
         leave_clear.update(Block(self, first_step).unknown_neighbors)
 
-        already_flagged = {loc for loc in self if self[loc].is_flagged}
+        already_flagged = [self.loc(i) for i in compress(range(len(self)), self.flagged)]
 
         for flag in already_flagged:
-            self.set_mine(flag)
+            self.mined[self.index(flag)] = 1
             flag_buffer = Block(self, flag).unknown_neighbors
             if len(self) - len(leave_clear) - len(flag_buffer) >= self.total_mines:
                 leave_clear.update(flag_buffer)
             mines_to_be_placed -= 1
 
-        for _ in range(mines_to_be_placed):
-            mine_placed = False
-            while not mine_placed:
-                candidate = random.choice(list(self))
-                if candidate in leave_clear or self[candidate].is_mined:
-                    continue
-                self.set_mine(candidate)
-                mine_placed = True
+        blocked = bytearray(self.mined)
+        for loc in leave_clear:
+            blocked[self.index(loc)] = 1
+        eligible = list(compress(range(len(self)), blocked.translate(_IS_ZERO)))
+
+        mines_to_be_placed = max(0, min(mines_to_be_placed, len(eligible)))
+        for i in rng.sample(eligible, mines_to_be_placed):
+            self.mined[i] = 1
+
+        self._count_surrounding_mines()
+
+    def packed_mines(self) -> bytes:
+        """
+        The mine layout, one bit per Cell, in index order.
+
+        Bit `i % 8` of byte `i // 8` is set if the Cell at index `i` is mined.
+        """
+        size = len(self)
+        if not size:
+            return b''
+        bits = int(self.mined.translate(_TO_DIGITS)[::-1], 2)
+        return bits.to_bytes((size + 7) // 8, 'little')
+
+    def unpack_mines(self, data: bytes):
+        """
+        Set every mine in a layout from packed_mines(), then count all neighbors.
+
+        Any mines already set are cleared first.
+        """
+        size = len(self)
+        if not size:
+            return
+        bits = int.from_bytes(data, 'little')
+        digits = format(bits, 'b').zfill(size)[::-1][:size].encode()
+        self.mined = bytearray(digits.translate(_FROM_DIGITS))
+        self._count_surrounding_mines()
+
+    def encode(self) -> bytes:
+        """
+        The board as compact bytes: a fixed header with the dimensions,
+        number of mines, seed and first step, followed by packed_mines().
+
+        Raises: ValueError if the seed is not an unsigned 64-bit integer.
+        """
+        flags = 0
+        seed = 0
+        if self.seed is not None:
+            if not 0 <= self.seed < 2 ** 64:
+                raise ValueError("seed must fit in 64 unsigned bits: {}".format(self.seed))
+            flags |= _HAS_SEED
+            seed = self.seed
+        x = y = 0
+        if self.first_step is not None:
+            flags |= _HAS_FIRST_STEP
+            x, y = self.first_step
+        header = BOARD_HEADER.pack(BOARD_MAGIC, BOARD_VERSION, flags, self.width, self.height,
+                                   self.total_mines, seed, x, y)
+        return header + self.packed_mines()
+
+    @staticmethod
+    def _read_header(data: bytes):
+        """Unpack and check the header of an encoded board."""
+        if len(data) < BOARD_HEADER.size:
+            raise ValueError("encoded board is too short")
+        magic, version, flags, width, height, total_mines, seed, x, y = BOARD_HEADER.unpack_from(data)
+        if magic != BOARD_MAGIC:
+            raise ValueError("not an encoded board")
+        if version != BOARD_VERSION:
+            raise ValueError("unsupported board version: {}".format(version))
+        if len(data) != BOARD_HEADER.size + (width * height + 7) // 8:
+            raise ValueError("encoded board has the wrong length")
+        seed = seed if flags & _HAS_SEED else None
+        first_step = (x, y) if flags & _HAS_FIRST_STEP else None
+        return width, height, total_mines, seed, first_step
+
+    def restore(self, data: bytes):
+        """
+        Set the mines, seed and first step from a board encoded by encode().
+
+        Raises: ValueError if `data` is not an encoded board of the same size.
+        """
+        width, height, total_mines, seed, first_step = self._read_header(data)
+        if (width, height) != (self.width, self.height):
+            raise ValueError("encoded board is {}x{}, not {}x{}".format(width, height, self.width, self.height))
+        self.unpack_mines(data[BOARD_HEADER.size:])
+        self.total_mines = total_mines
+        self.seed = seed
+        self.first_step = first_step
+
+    @classmethod
+    def decode(cls, data: bytes):
+        """New Minefield from a board encoded by encode()."""
+        width, height, total_mines, seed, first_step = cls._read_header(data)
+        field = cls(width, height, total_mines)
+        field.restore(data)
+        return field
+
+    def save(self, path):
+        """Write the encoded board to the file at `path`."""
+        with open(path, 'wb') as file:
+            file.write(self.encode())
+
+    @classmethod
+    def load(cls, path):
+        """New Minefield from a board saved at `path`."""
+        with open(path, 'rb') as file:
+            return cls.decode(file.read())
+
+    def has_unknown_neighbors(self, loc: tuple[int, int]) -> bool:
+        """Check if any neighbor of Cell at `loc` is neither naked nor flagged."""
+        return self.num_unknown_neighbors[self.index(loc)] > 0
+
+    def frontier_mask(self) -> bytes:
+        """1 for each naked Cell with at least one unknown neighbor, else 0."""
+        size = len(self)
+        naked = int.from_bytes(self.naked, 'little')
+        has_unknown = int.from_bytes(self.num_unknown_neighbors.translate(_IS_NONZERO), 'little')
+        return (naked & has_unknown).to_bytes(size, 'little')
+
+    def frontier(self):
+        """Indices of naked Cells with at least one unknown neighbor."""
+        return compress(range(len(self)), self.frontier_mask())
+
+    def unknown(self):
+        """Indices of Cells neither naked nor flagged."""
+        size = len(self)
+        known = int.from_bytes(self.naked, 'little') | int.from_bytes(self.flagged, 'little')
+        return compress(range(size), known.to_bytes(size, 'little').translate(_IS_ZERO))
 
     def uncover(self, loc: tuple[int, int]):
+        """Uncover Cell at coordinates `loc`, unless it is flagged."""
+        i = self.index(loc)
+        if self.flagged[i] or self.naked[i]:
+            return
+        self.naked[i] = 1
+        if self.mined[i]:
+            self.triggered = True
+        else:
+            self.num_naked_safe += 1
+        for neighbor in self.neighbor_table[i]:
+            self.num_unknown_neighbors[neighbor] -= 1
+        self._redraw(loc)
+
+    def open_region(self, loc: tuple[int, int]) -> list[int]:
         """
-        Uncover Cell at coordinates `loc`.
+        Uncover the whole opening around the naked, un-mined Cell at `loc`.
+
+        Floods outward through every Cell with no mined neighbors,
+        uncovering it and all of its neighbors, so the opening and its
+        numbered border are revealed in a single pass. Flagged Cells
+        are left alone.
 
-        If field is new, place mines first.
+        The neighbor counts are updated once for the whole region:
+        cell by cell for small openings, with one convolution of the
+        newly naked Cells for large ones.
+
+        Returns: indices of the Cells newly uncovered.
         """
-        self[loc].uncover()
+        start = self.index(loc)
+        if not self.naked[start] or self.mined[start] or self.surrounding_mines[start]:
+            return []
+
+        starts, indices = self.neighbor_table.starts, self.neighbor_table.indices
+        naked, flagged = self.naked, self.flagged
+        surrounding_mines = self.surrounding_mines
+
+        opened = []
+        to_visit = [start]
+        while to_visit:
+            i = to_visit.pop()
+            for neighbor in indices[starts[i]:starts[i + 1]]:
+                if naked[neighbor] or flagged[neighbor]:
+                    continue
+                naked[neighbor] = 1
+                opened.append(neighbor)
+                if not surrounding_mines[neighbor]:
+                    to_visit.append(neighbor)
+
+        size = len(self)
+        if len(opened) * 64 > size:
+            newly_naked = bytearray(size)
+            for i in opened:
+                newly_naked[i] = 1
+            unknown = int.from_bytes(self.num_unknown_neighbors, 'little')
+            unknown -= self._neighbor_sums(newly_naked)
+            self.num_unknown_neighbors = bytearray(unknown.to_bytes(size, 'little'))
+        else:
+            num_unknown_neighbors = self.num_unknown_neighbors
+            for i in opened:
+                for neighbor in indices[starts[i]:starts[i + 1]]:
+                    num_unknown_neighbors[neighbor] -= 1
+
+        self.num_naked_safe += len(opened)
+        if self.view:
+            for i in opened:
+                self.view.redraw(self.loc(i))
+        return opened
+
+    def flag(self, loc: tuple[int, int]):
+        """Flag Cell at coordinates `loc`, unless it is naked."""
+        i = self.index(loc)
+        if self.naked[i] or self.flagged[i]:
+            return
+        self.flagged[i] = 1
+        for neighbor in self.neighbor_table[i]:
+            self.num_unknown_neighbors[neighbor] -= 1
+            self.num_flagged_neighbors[neighbor] += 1
+        self._redraw(loc)
+
+    def un_flag(self, loc: tuple[int, int]):
+        """Un-flag Cell at coordinates `loc`."""
+        i = self.index(loc)
+        if not self.flagged[i]:
+            return
+        self.flagged[i] = 0
+        for neighbor in self.neighbor_table[i]:
+            self.num_unknown_neighbors[neighbor] += 1
+            self.num_flagged_neighbors[neighbor] -= 1
+        self._redraw(loc)
 
     def is_all_clear(self) -> bool:
         """Check if all un-mined cells are cleared."""
-        num_cleared = 0
-        for cell in self.values():
-            if cell.is_naked:
-                num_cleared += 1
         num_clearable = len(self) - self.total_mines
-        if num_cleared == num_clearable:
-            return True
-        else:
-            return False
+        return self.num_naked_safe == num_clearable
 
     def is_triggered(self) -> bool:
         """Check for any triggered mines. If found, detonate()"""
-        for cell in self.values():
-            if cell.is_naked and cell.is_mined:
-                self.detonate()
-                return True
-        return False
+        if self.triggered and not self.detonated:
+            self.detonate()
+        return self.triggered
 
     def detonate(self):
-        """Show all mistakes."""
-        for cell in self.values():
-            cell.show_mistakes()
+        """Show all mistakes. The view is told once, not Cell by Cell."""
+        self.detonated = True
+        if self.view:
+            self.view.detonated()
@@ -1,18 +1,29 @@
 import tkinter
+from tkinter import filedialog
 from control_panel import ControlPanel
-from game_settings import MAP_WIDTH, MAP_HEIGHT, PERCENT_MINED, ACTIVE_FIELD_MSG
+from game_settings import MAP_WIDTH, MAP_HEIGHT, PERCENT_MINED, RESULTS_DB
 from game import Game
+from results import ResultsStore, game_row
+from solver_trace import TracePlayer
 
 
 class Minesweeper(tkinter.Tk):
     """
     Main program window.
+
+    Every game played is added to the results store at `results_path`
+    when a new game or a replay replaces it. None to keep no results.
+    Trace playbacks were already played, so they are not added again.
     """
 
-    def __init__(self, width=MAP_WIDTH, height=MAP_HEIGHT, percent_mined=PERCENT_MINED):
+    def __init__(self, width=MAP_WIDTH, height=MAP_HEIGHT, percent_mined=PERCENT_MINED,
+                 results_path=RESULTS_DB):
         super().__init__()
         self.title("Minesweeper")
 
+        self.results = ResultsStore(results_path) if results_path else None
+        self._playing_trace = False
+
         self.control_panel = ControlPanel()
         self.control_panel.grid(row=0, column=0)
 
@@ -26,6 +37,10 @@ class Minesweeper(tkinter.Tk):
 
         self.control_panel.new_game_panel.new_game_button.config(command=self.new_game)
         self.control_panel.new_game_panel.replay_button.config(command=self.replay)
+        self.control_panel.new_game_panel.trace_button.config(command=self.open_trace)
+        self.control_panel.display_panel.pause_check.config(command=lambda: self.game.resume_solving())
+        self.control_panel.display_panel.step_button.config(command=lambda: self.game.step_once())
+        self.control_panel.stats_panel.dump_button.config(command=lambda: self.game.dump_stats())
 
     def new_game(self):
         """
@@ -35,33 +50,69 @@ class Minesweeper(tkinter.Tk):
         if new_percent_mined < 0:
             return
 
-        self.game.destroy()
-        self.game = Game(control_panel=self.control_panel,
-                         width=int(self.control_panel.new_game_panel.width_box.get()),
-                         height=int(self.control_panel.new_game_panel.height_box.get()),
-                         percent_mined=new_percent_mined)
-        self.game.grid(row=0, column=1)
-        self.control_panel.status_label.config(text=ACTIVE_FIELD_MSG)
+        self.game.stop_solving()
+        self.record_game()
+        self._playing_trace = False
+        self.game.reset(width=int(self.control_panel.new_game_panel.width_box.get()),
+                        height=int(self.control_panel.new_game_panel.height_box.get()),
+                        percent_mined=new_percent_mined)
 
     def replay(self):
-        """Resets minefield with the same mine layout."""
-        # TODO: this.
-        #  Game class should be initialized with number mines instead of percent.
-        #  Mines Left label should say 0 or ? until mines are actually placed.
-        layout = {loc: cell.is_mined for loc, cell in self.game.field.items()}
-        self.game.destroy()
-        self.game = Game(control_panel=self.control_panel,
-                         width=int(self.control_panel.new_game_panel.width_box.get()),
-                         height=int(self.control_panel.new_game_panel.height_box.get()),
-                         percent_mined=0)
-        self.game.grid(row=0, column=1)
-        self.control_panel.status_label.config(text=ACTIVE_FIELD_MSG)
-        self.game.is_new = False
-        [self.game.field.set_mine(mine) for mine in layout if layout[mine]]
+        """
+        Resets minefield with the same mine layout, laid out in one go.
+        Reuses the whole board, so back-to-back replays start at once.
+        """
+        engine = self.game.engine
+        self.game.stop_solving()
+        board = None if engine.is_new else engine.field.encode()
+        self.record_game()
+        self._playing_trace = False
+        self.game.reset(engine.width, engine.height, engine.percent_mined)
+        if board:
+            engine.restore(board)
+
+    def open_trace(self):
+        """Asks for a trace file and plays it back."""
+        path = filedialog.askopenfilename(parent=self, title="Play Trace",
+                                          filetypes=[("Solver traces", "*.trace"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            self.play_trace(path)
+        except (OSError, ValueError) as error:
+            self.control_panel.status_label.config(text="Can't play trace: {}".format(error))
+
+    def play_trace(self, path):
+        """
+        Plays back a trace recorded by a `TraceRecorder`, on a new board,
+        without running the solver.
+
+        Moves are showcased like the solver's, so the display settings set the pace.
+        """
+        player = TracePlayer(path)
+        if player.board is None:
+            return
+        field = player.new_field()
+        self.game.stop_solving()
+        self.record_game()
+        self._playing_trace = True
+        self.game.reset(field.width, field.height, 100 * field.total_mines / len(field))
+        self.game.engine.restore(player.board)
+        self.game.drive(self.game.engine.trace_steps(player))
+
+    def record_game(self):
+        """
+        Adds the current game to the results store, if it was played.
+
+        Stop any solving first, so the board isn't still changing.
+        """
+        if self.results and not self.game.engine.is_new and not self._playing_trace:
+            self.results.add([game_row(self.game.engine)])
 
-    # TODO: sqlite database storing pickled Game objects, so I can categorize
-    #  them and analyze based on which direction algorithm was used to solve
-    #  and how much of the board it was able to clear.
+    def destroy(self):
+        if self.results:
+            self.results.close()
+        super().destroy()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,58 @@
+from array import array
+from functools import lru_cache
+from itertools import chain
+
+
+class NeighborTable:
+    """
+    Indices of the neighbors of every cell on a `width` x `height` board.
+
+    Stored CSR-style in two flat arrays: the neighbors of the cell at
+    `index` are `indices[starts[index]:starts[index + 1]]`.
+    Cells are indexed by `x * height + y`, the same as in the Minefield.
+
+    Build these with `neighbor_table()`, which caches one per board size.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        # 4-byte indices keep the table to 36 bytes per cell, even on the largest boards.
+        self.starts = array('i', [0])
+        self.indices = array('i')
+
+        # Rows with the same edges share the same neighbor offsets, so each
+        #  run of rows is filled in one go.
+        if height == 1:
+            row_runs = [(0, 1, (0,))]
+        else:
+            row_runs = [(0, 1, (0, 1)), (1, height - 1, (-1, 0, 1)), (height - 1, height, (-1, 0))]
+
+        for x in range(width):
+            columns = [dx for dx in (-1, 0, 1) if 0 <= x + dx < width]
+            base = x * height
+            for first_row, end_row, rows in row_runs:
+                if end_row <= first_row:
+                    continue
+                deltas = [dx * height + dy for dx in columns for dy in rows if dx or dy]
+                self.indices.extend(chain.from_iterable(zip(
+                    *(range(base + first_row + delta, base + end_row + delta) for delta in deltas))))
+                last = self.starts[-1]
+                self.starts.extend(last + len(deltas) * row for row in range(1, end_row - first_row + 1))
+
+    def __getitem__(self, index: int) -> array:
+        return self.indices[self.starts[index]:self.starts[index + 1]]
+
+    def __len__(self):
+        return len(self.starts) - 1
+
+
+@lru_cache(maxsize=4)
+def neighbor_table(width: int, height: int) -> NeighborTable:
+    """Return the NeighborTable for a `width` x `height` board, building it only once."""
+    return NeighborTable(width, height)
+
+
 class Block(set):
     """
     A set of xy coordinates for all Cells immediately surrounding `locus` Cell.
@@ -21,6 +76,8 @@ class Block(set):
 
         unknown_neighbors (`set`): contains coordinates of neighboring "unknown" Cells.
 
+    Every Block built is counted in its Minefield's `blocks_built`.
+
     Methods:
 
         solve(): Analyze Cells in Block and return decision.
@@ -28,27 +85,25 @@ class Block(set):
 
     def __init__(self, field, center: tuple[int, int]):
         super().__init__()
+        field.blocks_built += 1
         self.field = field
         self.center = center
         self.naked_neighbors = set()
         self.flagged_neighbors = set()
         self.unknown_neighbors = set()
 
-        x, y = center
-        possible_neighbors = {
-            (x-1, y-1), (x, y-1), (x+1, y-1),
-            (x-1, y), (x+1, y),
-            (x-1, y+1), (x, y+1), (x+1, y+1),
-        }
-        for neighbor in possible_neighbors:
-            if neighbor in field:
-                self.add(neighbor)
-                if field[neighbor].is_naked:
-                    self.naked_neighbors.add(neighbor)
-                elif field[neighbor].is_flagged:
-                    self.flagged_neighbors.add(neighbor)
-                else:
-                    self.unknown_neighbors.add(neighbor)
+        height = field.height
+        naked = field.naked
+        flagged = field.flagged
+        for i in field.neighbor_table[field.index(center)]:
+            neighbor = divmod(i, height)
+            self.add(neighbor)
+            if naked[i]:
+                self.naked_neighbors.add(neighbor)
+            elif flagged[i]:
+                self.flagged_neighbors.add(neighbor)
+            else:
+                self.unknown_neighbors.add(neighbor)
 
     def solve(self) -> str:
         """
@@ -66,9 +121,10 @@ class Block(set):
 
             Otherwise, return "?"
         """
-        center_value = self.field[self.center].surrounding_mines
-        num_flagged = len(self.flagged_neighbors)
-        num_unknown = len(self.unknown_neighbors)
+        center = self.field.index(self.center)
+        center_value = self.field.surrounding_mines[center]
+        num_flagged = self.field.num_flagged_neighbors[center]
+        num_unknown = self.field.num_unknown_neighbors[center]
         possible_mines = num_flagged + num_unknown
 
         if center_value <= num_flagged:
@@ -0,0 +1,145 @@
+from math import exp, lgamma
+from frontier import Frontier
+
+
+def _log_comb(n: int, k: int) -> float:
+    """Natural log of `n` choose `k`."""
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def _convolve(a: dict, b: dict) -> dict:
+    """Distribution of the total number of mines of two independent groups, rescaled to a peak of 1."""
+    total = {}
+    for mines_a, weight_a in a.items():
+        for mines_b, weight_b in b.items():
+            total[mines_a + mines_b] = total.get(mines_a + mines_b, 0.0) + weight_a * weight_b
+    peak = max(total.values(), default=0.0)
+    if peak:
+        for mines in total:
+            total[mines] /= peak
+    return total
+
+
+class Probabilities:
+    """
+    Exact probability of every unknown Cell being mined.
+
+    Each Component of the Frontier counts its own layouts by number of mines.
+    Components are independent of each other, but not of the rest of the board:
+    every layout leaves some number of mines for the "interior" (the unknown
+    Cells away from the frontier), and a layout is weighted by the number of
+    ways to place those mines there.
+
+    Components are kept between calls, by signature, so only the Components
+    changed since the last call are counted again.
+
+    Attributes:
+
+        field (`Minefield`): Reference to Minefield containing Cells.
+
+    Methods:
+
+        calculate(mines_left): Return the probabilities.
+
+        safest(mines_left): Return the unknown Cell least likely to be mined.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self._cache = {}
+
+    def calculate(self, mines_left: int):
+        """
+        Calculate the probability of every unknown Cell being mined.
+
+        Args:
+            mines_left: Number of mines not yet flagged.
+
+        Returns: `tuple` of `(odds, interior_odds, interior)`, where `odds` maps the
+                 Minefield index of each frontier Cell to its probability, and
+                 `interior_odds` is the probability for each of the `interior`
+                 Cells. None if the board is inconsistent (a false flag).
+        """
+        field = self.field
+        frontier = Frontier(field, cache=self._cache)
+        components = frontier.components
+        self._cache = {component.signature: component for component in components}
+
+        num_unknown = len(field) - field.naked.count(1) - field.flagged.count(1)
+        interior = num_unknown - sum(len(component) for component in components)
+
+        counts = [component.counts() for component in components]
+        if not all(counts):
+            return None
+
+        # Distribution of all Components but one, from either side.
+        before = [{0: 1.0}]
+        for component_counts in counts:
+            before.append(_convolve(before[-1], component_counts))
+        after = [{0: 1.0}]
+        for component_counts in reversed(counts):
+            after.append(_convolve(after[-1], component_counts))
+        after.reverse()
+
+        # Relative number of ways to place whatever is left in the interior.
+        # Rescaled by the largest number of ways, which is as close to
+        #  half of the interior as the number of mines allows.
+        fewest_mines = max(0, mines_left - sum(max(component_counts) for component_counts in counts))
+        most_mines = min(mines_left, interior)
+        if fewest_mines > most_mines:
+            return None
+        top = _log_comb(interior, min(max(interior // 2, fewest_mines), most_mines))
+
+        def interior_ways(mines):
+            left = mines_left - mines
+            if left < 0 or left > interior:
+                return 0.0
+            return exp(_log_comb(interior, left) - top)
+
+        odds = {}
+        for i, component in enumerate(components):
+            others = _convolve(before[i], after[i + 1])
+            weights = {mines: sum(weight * interior_ways(mines + other_mines)
+                                  for other_mines, weight in others.items())
+                       for mines in counts[i]}
+            component_odds = component.mine_odds(weights)
+            if component_odds is None:
+                return None
+            odds.update(zip(component.variables, component_odds))
+
+        interior_odds = 0.0
+        if interior:
+            total = before[-1]
+            ways = {mines: weight * interior_ways(mines) for mines, weight in total.items()}
+            total_ways = sum(ways.values())
+            if not total_ways:
+                return None
+            interior_odds = sum(weight * (mines_left - mines) / interior
+                                for mines, weight in ways.items()) / total_ways
+
+        return odds, interior_odds, interior
+
+    def safest(self, mines_left: int):
+        """
+        Find the unknown Cell least likely to be mined.
+
+        Args:
+            mines_left: Number of mines not yet flagged.
+
+        Returns: `tuple` of `(loc, probability)`, or None if there is nothing to pick.
+        """
+        result = self.calculate(mines_left)
+        if result is None:
+            return None
+        odds, interior_odds, interior = result
+
+        best = min(odds, key=odds.get, default=None)
+        if best is not None and (not interior or odds[best] <= interior_odds):
+            return self.field.loc(best), odds[best]
+        if not interior:
+            return None
+
+        for i in self.field.unknown():
+            if i not in odds:
+                return self.field.loc(i), interior_odds
+        return None
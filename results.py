@@ -0,0 +1,155 @@
+import sqlite3
+
+
+# Columns of the `games` table, in order, after the `id`.
+COLUMNS = ("width", "height", "percent_mined", "total_mines", "seed", "direction",
+           "hyper", "frontier", "guessing", "cells_cleared", "safes_left",
+           "win", "game_over", "time", "board")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    percent_mined REAL NOT NULL,
+    total_mines INTEGER NOT NULL,
+    seed INTEGER,
+    direction TEXT NOT NULL,
+    hyper INTEGER NOT NULL,
+    frontier INTEGER NOT NULL,
+    guessing INTEGER NOT NULL,
+    cells_cleared INTEGER NOT NULL,
+    safes_left INTEGER NOT NULL,
+    win INTEGER NOT NULL,
+    game_over INTEGER NOT NULL,
+    time REAL,
+    board BLOB
+);
+CREATE INDEX IF NOT EXISTS games_direction ON games (direction, hyper);
+CREATE INDEX IF NOT EXISTS games_size ON games (width, height);
+CREATE INDEX IF NOT EXISTS games_density ON games (percent_mined);
+CREATE INDEX IF NOT EXISTS games_outcome ON games (win, game_over);
+"""
+
+
+def game_row(engine, elapsed=None) -> dict:
+    """
+    Results of a game, ready for `ResultsStore.add()`.
+
+    Args:
+        engine: `Engine` which played the game.
+        elapsed: Seconds the game took, if known.
+    """
+    field = engine.field
+    return {
+        "width": engine.width,
+        "height": engine.height,
+        "percent_mined": engine.percent_mined,
+        "total_mines": field.total_mines,
+        "seed": field.seed,
+        "direction": engine.direction.get(),
+        "hyper": bool(engine.hyper_solving.get()),
+        "frontier": bool(engine.frontier_solving.get()),
+        "guessing": bool(engine.guessing.get()),
+        "cells_cleared": field.num_naked_safe,
+        "safes_left": engine.safes_left,
+        "win": engine.win,
+        "game_over": engine.game_over,
+        "time": elapsed,
+        "board": field.encode(),
+    }
+
+
+class ResultsStore:
+    """
+    SQLite database of finished games.
+
+    Each game is one row of the `games` table: board size, density, seed
+    and solver settings, the outcome, and the board encoded with its first
+    click, so it can be replayed exactly (see `Minefield.encode()`). Indexed
+    by direction, size, density and outcome for quick ad-hoc queries.
+
+    The database runs in WAL mode, so it can be read while a batch run is
+    still writing to it. Rows are inserted in batches, one transaction each.
+
+    Attributes:
+        path (`str`): Location of the database file.
+
+        connection (`sqlite3.Connection`): Open connection to the database.
+
+    Methods:
+        add(rows): Insert `rows` of game results.
+
+        query(sql, params): Run any query and return every row.
+
+        solve_rates(**where): Win rate and mean cells cleared per direction and hyper setting.
+
+        close(): Close the connection.
+    """
+
+    def __init__(self, path, batch_size=10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, rows) -> int:
+        """
+        Insert `rows` of game results, `batch_size` rows per transaction.
+
+        Args:
+            rows: Iterable of `dict`s with a key for every name in COLUMNS,
+                  such as those from `game_row()`. Any other keys are ignored.
+
+        Returns: Number of rows inserted.
+        """
+        sql = "INSERT INTO games ({}) VALUES ({})".format(", ".join(COLUMNS), ", ".join("?" * len(COLUMNS)))
+        inserted = 0
+        batch = []
+        for row in rows:
+            batch.append(tuple(row.get(column) for column in COLUMNS))
+            if len(batch) >= self.batch_size:
+                with self.connection:
+                    self.connection.executemany(sql, batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            with self.connection:
+                self.connection.executemany(sql, batch)
+            inserted += len(batch)
+        return inserted
+
+    def query(self, sql, params=()) -> list:
+        """Run any query and return every row."""
+        return self.connection.execute(sql, params).fetchall()
+
+    def solve_rates(self, **where) -> list:
+        """
+        Win rate, loss rate and mean cells cleared for each direction and hyper setting.
+
+        Args:
+            where: Only count games whose columns equal these values,
+                   e.g. `width=30, height=16`.
+
+        Returns: `list` of `(direction, hyper, games, win_rate, loss_rate, mean_cells_cleared)`.
+        """
+        for column in where:
+            if column not in COLUMNS:
+                raise ValueError("unknown column: {}".format(column))
+        conditions = " AND ".join("{} = ?".format(column) for column in where) or "1"
+        return self.query(
+            "SELECT direction, hyper, COUNT(*), AVG(win), AVG(game_over), AVG(cells_cleared) "
+            "FROM games WHERE {} GROUP BY direction, hyper ORDER BY direction, hyper".format(conditions),
+            tuple(where.values()))
+
+    def close(self):
+        """Close the connection."""
+        self.connection.close()
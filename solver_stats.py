@@ -0,0 +1,146 @@
+"""
+Counters and timers for the solver's hot paths, and cProfile captures.
+
+Every Engine keeps a `SolverStats` as `engine.stats`, which costs no more than
+a few integer increments per step. To dump them, or profile one game headless:
+
+    python solver_stats.py --size 100 100 --percent 15 --seed 0 --json stats.json
+    python solver_stats.py --size 100 100 --percent 15 --seed 0 --profile solve.prof
+"""
+import argparse
+import cProfile
+import json
+import pstats
+import sys
+import time
+
+
+# Parts of the solve timed separately: each queue, then the Frontier and guessing.
+TIMED = ("clear_queue", "auto_queue", "hyper_queue", "frontier", "guess")
+
+
+class SolverStats:
+    """
+    Counters and timers for one Engine, from its latest reset.
+
+    Attributes:
+        engine (`Engine`): Engine being measured.
+
+        block_outcomes (`dict`): Number of times `Block.solve()` returned
+                                 each of "clear", "flag" and "?".
+
+        neighborhood_solves (`int`): Number of `Neighborhood.solve()` calls.
+
+        neighborhood_hits (`int`): Calls which found anything to clear or flag.
+
+        uncovers (`int`): Cells uncovered one at a time, by a click or from the `clear_queue`.
+                          Openings uncovered along with them aren't counted.
+
+        flags (`int`), un_flags (`int`): Flags placed and removed.
+
+        time (`dict`): Seconds spent solving in each part of TIMED. Pauses
+                       to showcase a step aren't counted.
+
+        steps (`dict`): Number of steps taken from each queue.
+
+    Methods:
+        reset(): Start counting from zero.
+
+        snapshot(): Every counter and timer, as a `dict` ready for JSON.
+
+        dump(path): Write snapshot() to the file at `path`, as JSON.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.reset()
+
+    def reset(self):
+        """Start counting from zero."""
+        self._blocks_at_start = self.engine.field.blocks_built
+        self._started = time.perf_counter()
+        self.block_outcomes = {"clear": 0, "flag": 0, "?": 0}
+        self.neighborhood_solves = 0
+        self.neighborhood_hits = 0
+        self.uncovers = 0
+        self.flags = 0
+        self.un_flags = 0
+        self.time = dict.fromkeys(TIMED, 0.0)
+        self.steps = dict.fromkeys(TIMED[:3], 0)
+
+    def snapshot(self) -> dict:
+        """Every counter and timer, as a `dict` ready for JSON."""
+        engine = self.engine
+        queues = {"clear_queue": engine.clear_queue, "auto_queue": engine.auto_queue,
+                  "hyper_queue": engine.hyper_queue}
+        return {
+            "elapsed": time.perf_counter() - self._started,
+            "blocks": engine.field.blocks_built - self._blocks_at_start,
+            "block_outcomes": dict(self.block_outcomes),
+            "neighborhood_solves": self.neighborhood_solves,
+            "neighborhood_hits": self.neighborhood_hits,
+            "uncovers": self.uncovers,
+            "cells_cleared": engine.field.num_naked_safe,
+            "flags": self.flags,
+            "un_flags": self.un_flags,
+            "steps": dict(self.steps),
+            "time": dict(self.time),
+            "re_orients": {name: queue.re_orients for name, queue in queues.items()},
+            "peak_queue_lengths": {name: queue.peak_length for name, queue in queues.items()},
+        }
+
+    def dump(self, path):
+        """Write snapshot() to the file at `path`, as JSON."""
+        with open(path, "w") as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+
+def profile_call(path, func, *args):
+    """
+    Call `func` with `args` under cProfile, and write the profile to `path`.
+
+    Only the calling thread is profiled, so this can wrap a solve on a worker thread.
+    Read the file back with `pstats.Stats(path)`.
+
+    Returns: whatever `func` returns.
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        profiler.dump_stats(path)
+
+
+def main(argv=None):
+    from benchmark import DIRECTIONS
+    from engine import Engine
+    from game_settings import Setting
+
+    parser = argparse.ArgumentParser(description="Measure one headless solve.")
+    parser.add_argument("--size", nargs=2, type=int, default=(100, 100), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--percent", type=float, default=15, help="percent of cells mined")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--direction", choices=DIRECTIONS, default="LIFO")
+    parser.add_argument("--json", help="write the counters here instead of to stdout")
+    parser.add_argument("--profile", metavar="PATH", help="profile the solve with cProfile, and write it here")
+    parser.add_argument("--top", type=int, default=25, help="functions to print from the profile")
+    args = parser.parse_args(argv)
+
+    width, height = args.size
+    engine = Engine(width, height, args.percent, direction=Setting(args.direction), seed=args.seed)
+    first_click = (width // 2, height // 2)
+    if args.profile:
+        profile_call(args.profile, engine.left_click, first_click)
+        pstats.Stats(args.profile).sort_stats("cumulative").print_stats(args.top)
+    else:
+        engine.left_click(first_click)
+
+    if args.json:
+        engine.stats.dump(args.json)
+    else:
+        json.dump(engine.stats.snapshot(), sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import queue
+import threading
+import time
+from game_settings import Setting, Emphasis
+
+
+# Engine attributes holding settings, which are read from Tk variables
+#  and so must be copied before the Engine moves to another thread.
+SETTING_NAMES = ("auto_solving", "hyper_solving", "frontier_solving", "guessing", "direction")
+
+
+class ChangeFeed:
+    """
+    Stands in for the display while the Engine runs on a worker thread.
+
+    Only notes what changed, in a thread-safe queue, for the Tk side
+    to pick up. Highlights are skipped entirely.
+    """
+
+    def __init__(self):
+        self.changes = queue.SimpleQueue()
+
+    def redraw(self, loc):
+        self.changes.put(loc)
+
+    def paint(self, loc, bg):
+        pass
+
+    def highlight(self, loc):
+        return None
+
+    def update(self):
+        pass
+
+    def detonated(self):
+        self.changes.put(("detonated", True))
+
+    def show_status(self, msg):
+        self.changes.put(("status", msg))
+
+    def show_mines_left(self, mines_left):
+        self.changes.put(("mines_left", mines_left))
+
+    def show_safes_left(self, safes_left):
+        self.changes.put(("safes_left", safes_left))
+
+
+class BackgroundSolver:
+    """
+    Runs an Engine method on a worker thread, at full speed.
+
+    While it runs, the Engine and its Minefield report to a `ChangeFeed`
+    instead of the display, every emphasis is switched off, and each
+    setting is frozen at its value when the solver started. Everything
+    is put back by finish(), which must be called from the Tk thread.
+
+    Attributes:
+        engine (`Engine`): Engine doing the solving.
+
+        feed (`ChangeFeed`): Changes not yet picked up by the display.
+
+        started (`float`): `time.perf_counter()` when the solver started.
+
+    Methods:
+        start(): Start solving on the worker thread.
+
+        drain(): Everything changed since the last call.
+
+        is_done(): Return True once the worker has finished.
+
+        cells_per_second(): Safe cells cleared per second so far.
+
+        finish(): Wait for the worker, then give the Engine back to the display.
+    """
+
+    def __init__(self, engine, action, *args):
+        self.engine = engine
+        self.feed = ChangeFeed()
+        self._action = action
+        self._args = args
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._saved = None
+        self.started = None
+        self._safes_at_start = engine.safes_left
+
+    def _run(self):
+        self._action(*self._args)
+
+    def start(self):
+        """Start solving on the worker thread."""
+        engine = self.engine
+        self._saved = (engine.view, engine.field.view, engine.emphasis,
+                       {name: getattr(engine, name) for name in SETTING_NAMES})
+        for name in SETTING_NAMES:
+            setattr(engine, name, Setting(getattr(engine, name).get()))
+        engine.emphasis = {name: Emphasis() for name in engine.emphasis}
+        engine.view = engine.field.view = self.feed
+        for solving_queue in self._queues():
+            solving_queue.direction_var = engine.direction
+
+        self.started = time.perf_counter()
+        self._safes_at_start = engine.safes_left
+        self._thread.start()
+
+    def _queues(self):
+        return self.engine.clear_queue, self.engine.auto_queue, self.engine.hyper_queue
+
+    def drain(self):
+        """
+        Everything changed since the last call.
+
+        Returns: `tuple` of `(locs, counters)`: the `set` of locations to redraw,
+                 and a `dict` of the latest status and counter values.
+        """
+        locs = set()
+        counters = {}
+        changes = self.feed.changes
+        while True:
+            try:
+                change = changes.get_nowait()
+            except queue.Empty:
+                return locs, counters
+            if isinstance(change[0], str):
+                counters[change[0]] = change[1]
+            else:
+                locs.add(change)
+
+    def is_done(self) -> bool:
+        """Return True once the worker has finished."""
+        return self.started is not None and not self._thread.is_alive()
+
+    def cells_per_second(self) -> float:
+        """Safe cells cleared per second so far."""
+        elapsed = time.perf_counter() - self.started
+        if elapsed <= 0:
+            return 0.0
+        return (self._safes_at_start - self.engine.safes_left) / elapsed
+
+    def finish(self):
+        """Wait for the worker, then give the Engine back to the display."""
+        self._thread.join()
+        view, field_view, emphasis, settings = self._saved
+        engine = self.engine
+        engine.view = view
+        engine.field.view = field_view
+        engine.emphasis = emphasis
+        for name, setting in settings.items():
+            setattr(engine, name, setting)
+        for solving_queue in self._queues():
+            solving_queue.direction_var = engine.direction
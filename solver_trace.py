@@ -0,0 +1,183 @@
+"""
+Record every move the solver makes, and play it back later without re-solving.
+
+A trace is a binary file: a short header, then one fixed-size record per event.
+The board itself is stored once, encoded by `Minefield.encode()`, as soon as
+the mines are placed. `Engine.trace_steps()` plays a trace back on a board,
+which a display drives like any other solve. To review a trace as text, one
+JSON object per line:
+
+    python solver_trace.py game.trace
+"""
+import json
+import struct
+import sys
+from collections import namedtuple
+from minefield import Minefield
+
+
+TRACE_MAGIC = b'MSTR'
+TRACE_VERSION = 1
+_HEADER = struct.Struct('<4sB')
+
+# Actions.
+UNCOVER, FLAG, UN_FLAG, CLEAR, BOARD = range(5)
+ACTION_NAMES = ("uncover", "flag", "un_flag", "clear", "board")
+
+# Rules responsible for an action.
+USER, BLOCK, NEIGHBORHOOD, FRONTIER, GUESS = range(5)
+RULE_NAMES = ("user", "block", "neighborhood", "frontier", "guess")
+
+# Queues an action came out of.
+NO_QUEUE, CLEAR_QUEUE, AUTO_QUEUE, HYPER_QUEUE = range(4)
+QUEUE_NAMES = (None, "clear_queue", "auto_queue", "hyper_queue")
+
+# action, step, x, y, rule, queue
+_EVENT = struct.Struct('<BIIIBB')
+# The rest of a BOARD record: length of the encoded board that follows.
+_BOARD_LENGTH = struct.Struct('<I')
+
+Event = namedtuple("Event", ("step", "loc", "action", "rule", "queue"))
+
+
+class TraceRecorder:
+    """
+    Writes solver events to a trace file, as they happen.
+
+    Attach to `Engine.trace` before the first click.
+
+    Attributes:
+        path (`str`): Location of the trace file.
+
+    Methods:
+        record(step, loc, action, rule, queue): Write one event.
+
+        record_board(board): Write the encoded board.
+
+        close(): Flush and close the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'wb')
+        self._write = self._file.write
+        self._write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, step: int, loc: tuple[int, int], action: int, rule: int, queue: int):
+        """Write one event. See the action, rule and queue codes at the top of solver_trace.py"""
+        self._write(_EVENT.pack(action, step, loc[0], loc[1], rule, queue))
+
+    def record_board(self, board: bytes):
+        """Write a board encoded by `Minefield.encode()`."""
+        self._write(bytes([BOARD]) + _BOARD_LENGTH.pack(len(board)) + board)
+
+    def close(self):
+        """Flush and close the file."""
+        self._file.close()
+
+
+class TracePlayer:
+    """
+    Reads a trace file and plays it back onto a Minefield.
+
+    On an Engine's Minefield, play back through `Engine.trace_steps()`,
+    which also keeps the Engine's counters and status up to date.
+
+    Attributes:
+        board (`bytes`): Board encoded by `Minefield.encode()`. None if the
+                         trace ended before any mines were placed.
+
+        events (`list`): Every `Event` after the board, in order.
+
+    Methods:
+        new_field(): New Minefield with the traced board.
+
+        apply(field): Generator. Applies each event to `field` in turn.
+    """
+
+    def __init__(self, path):
+        """
+        Reads the whole trace at `path`.
+
+        Raises: ValueError if it isn't a trace file, or is cut short, such as
+                by a recording stopped mid-write, or holds an unknown code.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError("not a trace file: {}".format(path))
+        magic, version = _HEADER.unpack_from(data)
+        if magic != TRACE_MAGIC:
+            raise ValueError("not a trace file: {}".format(path))
+        if version != TRACE_VERSION:
+            raise ValueError("unsupported trace version: {}".format(version))
+
+        self.board = None
+        self.events = []
+        offset = _HEADER.size
+        while offset < len(data):
+            if data[offset] == BOARD:
+                if offset + 1 + _BOARD_LENGTH.size > len(data):
+                    raise ValueError("trace cut short: {}".format(path))
+                length, = _BOARD_LENGTH.unpack_from(data, offset + 1)
+                offset += 1 + _BOARD_LENGTH.size
+                if offset + length > len(data):
+                    raise ValueError("trace cut short: {}".format(path))
+                self.board = data[offset:offset + length]
+                self.events = []
+                offset += length
+                continue
+            if offset + _EVENT.size > len(data):
+                raise ValueError("trace cut short: {}".format(path))
+            action, step, x, y, rule, queue = _EVENT.unpack_from(data, offset)
+            if action >= BOARD or rule >= len(RULE_NAMES) or queue >= len(QUEUE_NAMES):
+                raise ValueError("unknown event at byte {} of {}".format(offset, path))
+            offset += _EVENT.size
+            # Anything before the mines were placed can't be played back.
+            if self.board is not None:
+                self.events.append(Event(step, (x, y), action, rule, queue))
+
+    def new_field(self) -> Minefield:
+        """New Minefield with the traced board."""
+        return Minefield.decode(self.board)
+
+    def apply(self, field):
+        """
+        Apply each event to `field` in turn, exactly as the Engine did.
+
+        `field` must already hold the traced board. Yields each `Event`
+        once it has been applied.
+        """
+        for event in self.events:
+            loc = event.loc
+            if event.action == UNCOVER:
+                field.uncover(loc)
+                field.open_region(loc)
+                if field.triggered:
+                    field.is_triggered()
+            elif event.action == FLAG:
+                field.flag(loc)
+            elif event.action == UN_FLAG:
+                field.un_flag(loc)
+            elif event.action == CLEAR:
+                field[loc].bg = "new_clear"
+            yield event
+
+
+def event_json(event: Event) -> str:
+    """One event as a line of JSON."""
+    return json.dumps({"step": event.step, "x": event.loc[0], "y": event.loc[1],
+                       "action": ACTION_NAMES[event.action], "rule": RULE_NAMES[event.rule],
+                       "queue": QUEUE_NAMES[event.queue]})
+
+
+if __name__ == "__main__":
+    for trace_event in TracePlayer(sys.argv[1]).events:
+        print(event_json(trace_event))
@@ -1,15 +1,24 @@
+import heapq
 import random
-from neighborhood import Block
-from game_settings import pause
+from collections import OrderedDict
+from itertools import count
 
 
-class Queue(list):
+# Offsets of the 24 cells within two steps of a cell (Chebyshev distance 2).
+# Only cells this close can share unknown neighbors.
+NEARBY_OFFSETS = tuple((dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if dx or dy)
+
+
+class Queue:
     """
-    A list of coordinates to be iteratively processed.
+    An ordered set of coordinates to be iteratively processed.
+
+    Backed by an `OrderedDict`, so membership, appending, removal and
+    access to either end all take constant time.
 
     Highlights the Cells whose coordinates it contains.
 
-    This list re-orients to process coordinates based on chosen direction.
+    This Queue re-orients to process coordinates based on chosen direction.
 
     Attributes:
 
@@ -28,19 +37,59 @@ class Queue(list):
             that west-most coordinates will be processed first, and the algorithm
             will work its way towards the east.
 
-        is_busy (`bool`): If the Queue is already being processed, this is
-            set to True, preventing any new processes from initiating
-            a call to process it.
+        rng: Random number generator used for the "random" direction.
+             The `random` module unless replaced.
+
+    Methods:
+
+        first(), last(): Coordinates at either end of the Queue.
+
+        append(cell), remove(cell), clear(): Add or remove coordinates.
+
+        reverse(): Reverse the order of the Queue, in constant time.
 
-            This measure prevents recursion errors.
+        re_orient(): Re-order the Queue based on `direction`.
+
+        peek(): Re-orient and return the coordinates to process next.
+
+        near(cell): Coordinates in Queue within two steps of `cell`.
     """
 
     def __init__(self, field=None, color=None, direction="LIFO"):
-        super().__init__()
         self.field = field
         self.color = color
         self.direction = direction
-        self.is_busy = False
+
+        self.rng = random
+
+        # Maps each cell to the order it was added in.
+        self._cells = OrderedDict()
+        self._is_reversed = False
+        self._counter = count()
+
+    def __contains__(self, cell):
+        return cell in self._cells
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __iter__(self):
+        if self._is_reversed:
+            return reversed(self._cells)
+        return iter(self._cells)
+
+    def __reversed__(self):
+        if self._is_reversed:
+            return iter(self._cells)
+        return reversed(self._cells)
+
+    def first(self) -> tuple[int, int]:
+        """Coordinates at the front of the Queue."""
+        return next(iter(self))
+
+    def last(self) -> tuple[int, int]:
+        """Coordinates at the back of the Queue."""
+        return next(reversed(self))
 
     def append(self, cell: tuple[int, int]) -> None:
         """
@@ -49,12 +98,14 @@ class Queue(list):
         Args:
             cell: `tuple` coordinates to add to Queue.
         """
-        if cell in self:
+        if cell in self._cells:
             return
 
         if self.color:
             self.field[cell].bg = self.color
-        super().append(cell)
+        self._cells[cell] = next(self._counter)
+        if self._is_reversed:
+            self._cells.move_to_end(cell, last=False)
 
     def remove(self, cell: tuple[int, int]) -> None:
         """
@@ -63,11 +114,46 @@ class Queue(list):
         Args:
             cell: `tuple` coordinates to remove from Queue.
         """
-        if cell not in self:
+        if cell not in self._cells:
             return
 
         self.field[cell].bg = 'naked'
-        super().remove(cell)
+        del self._cells[cell]
+
+    def clear(self) -> None:
+        """Removes all coordinates from Queue. Highlights are left as they are."""
+        self._cells.clear()
+        self._is_reversed = False
+
+    def reverse(self) -> None:
+        """Reverses the order of the Queue."""
+        self._is_reversed = not self._is_reversed
+
+    def peek(self) -> tuple[int, int]:
+        """Re-orients, then returns the coordinates to process next."""
+        self.re_orient()
+        if self.direction == "FIFO":
+            return self.first()
+        return self.last()
+
+    def near(self, cell: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Returns coordinates in Queue within two steps of `cell`,
+        latest addition first.
+
+        Looks up the 24 surrounding locations directly, so this takes
+        constant time no matter how long the Queue is.
+        """
+        x, y = cell
+        cells = self._cells
+        nearby = [(x + dx, y + dy) for dx, dy in NEARBY_OFFSETS if (x + dx, y + dy) in cells]
+        nearby.sort(key=cells.get, reverse=True)
+        return nearby
+
+    def _reorder(self, cells) -> None:
+        """Replaces the order of the Queue with the order of `cells`."""
+        self._cells = OrderedDict((cell, next(self._counter)) for cell in cells)
+        self._is_reversed = False
 
     def re_orient(self):
         """Sorts Queue based on `direction`"""
@@ -75,7 +161,9 @@ class Queue(list):
             return
 
         if self.direction == "random":
-            random.shuffle(self)
+            cells = list(self)
+            self.rng.shuffle(cells)
+            self._reorder(cells)
             return
 
         if self.direction == "whiplash":
@@ -87,7 +175,7 @@ class Queue(list):
         else:
             sort_index = 1
 
-        self.sort(key=lambda cell: cell[sort_index])
+        self._reorder(sorted(self, key=lambda cell: cell[sort_index]))
         if self.direction in ("south", "east"):
             self.reverse()
 
@@ -97,78 +185,188 @@ class SuperQueue(Queue):
     A special Queue with access to the direction tkinter variable
     in the control panel.
 
+    Rather than re-sorting or shuffling everything at each step, a SuperQueue
+    keeps an index for the current direction: a heap keyed by the sort axis
+    for the four cardinal directions, or an array to pick from for "random".
+    The index is only rebuilt when the direction changes.
+
     Attributes:
         direction_var: Reference to `direction` variable in control panel.
 
+        peak_length (`int`): Most cells ever held at once.
+
+        re_orients (`int`): Number of calls to re_orient().
+
     Methods:
         re_orient(): Overrides Queue's re_orient() method to get the current
                      direction from the tkinter variable in the control panel.
 
-        add_batch(): Adds batch of cell coordinates to SuperQueue.
-        clean_up(): Removes any cells which are no longer useful.
+        peek(): Overrides Queue's peek() method to use the index.
+
+        add_batch_steps(batch, color): Generator. Adds batch of cell coordinates to SuperQueue.
+        clean_up_steps(cells): Generator. Removes any cells which are no longer useful.
                     Corrects highlights.
+
+                    Both yield wherever there is something to showcase.
     """
 
-    def __init__(self, field, color, direction_var):
+    # Heap key for each cardinal direction. Smallest key is processed first.
+    # "east" starts at the west-most coordinates and works its way east.
+    HEAP_KEYS = {
+        "east": lambda cell: cell[0],
+        "west": lambda cell: -cell[0],
+        "south": lambda cell: cell[1],
+        "north": lambda cell: -cell[1],
+    }
+
+    def __init__(self, field, color, direction_var, rng=None):
         super().__init__(field=field, color=color)
+        if rng:
+            self.rng = rng
 
         self.direction_var = direction_var
         self.direction = direction_var.get()
+        self.peak_length = 0
+        self.re_orients = 0
+
+        self._heap = []
+        self._slots = []
+        self._slot_of = {}
+        self._build_index()
+
+    def _build_index(self):
+        """Builds the index for the current direction from scratch."""
+        self._heap = []
+        self._slots = []
+        self._slot_of = {}
+        if self.direction in self.HEAP_KEYS:
+            self._heap = [self._heap_entry(cell) for cell in self._cells]
+            heapq.heapify(self._heap)
+        elif self.direction == "random":
+            self._slots = list(self._cells)
+            self._slot_of = {cell: slot for slot, cell in enumerate(self._slots)}
+
+    def _heap_entry(self, cell):
+        """Ties are broken in favor of the latest addition."""
+        return self.HEAP_KEYS[self.direction](cell), -self._cells[cell], cell
+
+    def append(self, cell: tuple[int, int]) -> None:
+        """Adds `cell` to SuperQueue and to the index. See Queue.append()"""
+        if cell in self._cells:
+            return
+
+        super().append(cell)
+        if len(self._cells) > self.peak_length:
+            self.peak_length = len(self._cells)
+        if self.direction in self.HEAP_KEYS:
+            heapq.heappush(self._heap, self._heap_entry(cell))
+        elif self.direction == "random":
+            self._slot_of[cell] = len(self._slots)
+            self._slots.append(cell)
+
+    def remove(self, cell: tuple[int, int]) -> None:
+        """
+        Removes `cell` from SuperQueue and from the index. See Queue.remove()
+
+        Heap entries are left in place, and skipped once they reach the top.
+        """
+        if cell not in self._cells:
+            return
+
+        super().remove(cell)
+        if self.direction in self.HEAP_KEYS and len(self._heap) > 2 * len(self._cells) + 64:
+            self._build_index()
+        elif self.direction == "random":
+            slot = self._slot_of.pop(cell)
+            last_cell = self._slots.pop()
+            if last_cell != cell:
+                self._slots[slot] = last_cell
+                self._slot_of[last_cell] = slot
+
+    def clear(self) -> None:
+        """Removes all coordinates from SuperQueue and its index."""
+        super().clear()
+        self._build_index()
 
     def re_orient(self):
-        """Updates direction from control panel then calls super."""
-        self.direction = self.direction_var.get()
-        super().re_orient()
+        """
+        Updates direction from control panel.
 
-    def add_batch(self, batch: set[tuple[int, int]], emphasis, color):
+        Rebuilds the index only if the direction changed.
+        Whiplash still reverses the SuperQueue with every call.
         """
-        Adds `batch` of cell coordinates to SuperQueue.
+        self.re_orients += 1
+        direction = self.direction_var.get()
+        if direction != self.direction:
+            self.direction = direction
+            self._build_index()
 
-        Highlights and pauses based on settings in display panel.
+        if self.direction == "whiplash":
+            self.reverse()
 
-        Args:
-            batch: `set` of cell coordinates.
-            emphasis: Reference to the appropriate group of settings in
-                      the display panel.
-            color: `str` color to highlight cells that are being added
-                   to the SuperQueue.
+    def peek(self) -> tuple[int, int]:
+        """Re-orients, then returns the coordinates to process next."""
+        self.re_orient()
+
+        if self.direction in self.HEAP_KEYS:
+            heap = self._heap
+            while True:
+                key, order, cell = heap[0]
+                if self._cells.get(cell) == -order:
+                    return cell
+                heapq.heappop(heap)
+
+        if self.direction == "random":
+            return self.rng.choice(self._slots)
+
+        if self.direction == "FIFO":
+            return self.first()
+        return self.last()
+
+    def add_batch_steps(self, batch: set[tuple[int, int]], color):
+        """
+        Generator. Adds `batch` of cell coordinates to SuperQueue,
+        highlighted with `color` on the way in.
+
+        Yields once the new cells are highlighted, before they join the SuperQueue,
+        so the caller can showcase them.
         """
         new_batch = Queue(field=self.field, color=color)
+        new_batch.rng = self.rng
         for cell in batch:
             if cell not in self:
                 new_batch.append(cell)
         new_batch.direction = self.direction_var.get()
         new_batch.re_orient()
-        if emphasis.is_checked:
-            [self.field[cell].update() for cell in new_batch]
-            pause(emphasis.pause_time)
+        yield
         while new_batch:
-            new_cell = new_batch[0]
+            new_cell = new_batch.first()
             new_batch.remove(new_cell)
             self.append(new_cell)
 
-    def clean_up(self, emphasis):
+    def clean_up_steps(self, cells=None):
         """
-        Removes all cells from SuperQueue which have no unknown neighbors.
-        Also corrects any highlighting issues.
-
-        Highlights and pauses based on settings in display panel.
+        Generator. Removes all cells from SuperQueue which have no unknown neighbors.
+        Also corrects any highlighting issues. Only checks `cells`, if given;
+        cells not in the SuperQueue are ignored.
 
-        Args:
-            emphasis: Reference to the appropriate group of settings in
-                      the display panel.
+        Yields once any redundant cells are highlighted, before they are dropped,
+        so the caller can showcase them.
         """
+        if cells is None:
+            cells = list(reversed(self))
+        else:
+            cells = [cell for cell in cells if cell in self]
+
         redundant = Queue(field=self.field, color="redundant")
-        for cell in self[::-1]:
-            block = Block(self.field, cell)
-            if not block.unknown_neighbors:
+        for cell in cells:
+            if not self.field.has_unknown_neighbors(cell):
                 self.remove(cell)
                 redundant.append(cell)
             elif self.field[cell].bg != self.color:
                 self.field[cell].bg = self.color
 
-        if redundant and emphasis.is_checked:
-            [self.field[cell].update() for cell in redundant]
-            pause(emphasis.pause_time)
+        if redundant:
+            yield
         while redundant:
-            redundant.remove(redundant[-1])
+            redundant.remove(redundant.last())
@@ -0,0 +1,49 @@
+"""Small boards in the middle of a game, for checking the solvers against brute force."""
+import random
+from minefield import Minefield
+
+
+def mid_game(width, height, total_mines, seed, uncovers=3, flags=1):
+    """
+    A seeded board after the first click, a few more safe uncovers and a few correct flags.
+
+    Extra uncovers and flags are picked next to the naked Cells, so the frontier has some shape.
+    """
+    rng = random.Random(seed)
+    field = Minefield(width, height, total_mines)
+    first_step = (rng.randrange(width), rng.randrange(height))
+    field.place_mines(first_step, seed=seed)
+    uncover(field, first_step)
+
+    for _ in range(uncovers):
+        safe = [field.loc(i) for i in field_edge(field) if not field.mined[i]]
+        if safe:
+            uncover(field, rng.choice(safe))
+    for _ in range(flags):
+        mined = [field.loc(i) for i in field_edge(field) if field.mined[i]]
+        if mined:
+            field.flag(rng.choice(mined))
+    return field
+
+
+def uncover(field, loc):
+    field.uncover(loc)
+    field.open_region(loc)
+
+
+def field_edge(field):
+    """Indices of the unknown Cells next to any naked Cell."""
+    naked, flagged = field.naked, field.flagged
+    table = field.neighbor_table
+    return sorted({j for i in range(len(field)) if naked[i]
+                   for j in table[i] if not naked[j] and not flagged[j]})
+
+
+def unknown(field):
+    """Indices of every Cell neither naked nor flagged."""
+    return [i for i in range(len(field)) if not field.naked[i] and not field.flagged[i]]
+
+
+def constraints(field):
+    """`(index, mines left around it)` for every naked Cell next to an unknown one."""
+    return [(i, field.surrounding_mines[i] - field.num_flagged_neighbors[i]) for i in field.frontier()]
@@ -0,0 +1,117 @@
+import os
+import random
+import tempfile
+import unittest
+from minefield import Minefield, BOARD_HEADER
+
+
+# Board sizes, most of them not a multiple of 8 cells.
+SIZES = [(1, 1), (1, 7), (3, 5), (2, 4), (7, 9), (8, 8), (13, 11), (30, 16), (17, 1)]
+
+
+def random_field(width, height, seed, density=0.3):
+    """Minefield with a random layout, set straight from the cells, not by place_mines()."""
+    rng = random.Random(seed)
+    field = Minefield(width, height, 0)
+    mines = [loc for loc in field if rng.random() < density]
+    field.total_mines = len(mines)
+    field.set_mines(mines)
+    return field
+
+
+class TestPackedMines(unittest.TestCase):
+
+    def test_round_trip(self):
+        for width, height in SIZES:
+            for seed in range(5):
+                with self.subTest(size=(width, height), seed=seed):
+                    field = random_field(width, height, seed)
+                    packed = field.packed_mines()
+                    self.assertEqual(len(packed), (width * height + 7) // 8)
+
+                    copy = Minefield(width, height, field.total_mines)
+                    copy.unpack_mines(packed)
+                    self.assertEqual(copy.mined, field.mined)
+                    self.assertEqual(copy.surrounding_mines, field.surrounding_mines)
+
+    def test_bit_order(self):
+        # Bit i % 8 of byte i // 8 is the Cell at index i.
+        field = Minefield(3, 5, 3)
+        field.set_mines([field.loc(0), field.loc(9), field.loc(14)])
+        self.assertEqual(field.packed_mines(), bytes([0b00000001, 0b01000010]))
+
+    def test_extremes(self):
+        for width, height in SIZES:
+            with self.subTest(size=(width, height)):
+                empty = Minefield(width, height, 0)
+                full = Minefield(width, height, width * height)
+                full.set_mines(list(full))
+                for field in (empty, full):
+                    copy = Minefield(width, height, field.total_mines)
+                    copy.unpack_mines(field.packed_mines())
+                    self.assertEqual(copy.mined, field.mined)
+
+    def test_unpack_clears_earlier_mines(self):
+        field = random_field(7, 9, 0)
+        other = random_field(7, 9, 1)
+        field.unpack_mines(other.packed_mines())
+        self.assertEqual(field.mined, other.mined)
+
+
+class TestEncode(unittest.TestCase):
+
+    def test_round_trip(self):
+        for width, height in SIZES:
+            with self.subTest(size=(width, height)):
+                field = Minefield(width, height, width * height // 5)
+                field.place_mines((width // 2, height // 2), seed=width * 1000 + height)
+                data = field.encode()
+                self.assertEqual(len(data), BOARD_HEADER.size + (width * height + 7) // 8)
+
+                copy = Minefield.decode(data)
+                self.assertEqual((copy.width, copy.height), (width, height))
+                self.assertEqual(copy.total_mines, field.total_mines)
+                self.assertEqual(copy.seed, field.seed)
+                self.assertEqual(copy.first_step, field.first_step)
+                self.assertEqual(copy.mined, field.mined)
+                self.assertEqual(copy.surrounding_mines, field.surrounding_mines)
+                self.assertEqual(copy.encode(), data)
+
+    def test_without_seed_or_first_step(self):
+        field = random_field(7, 9, 2)
+        copy = Minefield.decode(field.encode())
+        self.assertIsNone(copy.seed)
+        self.assertIsNone(copy.first_step)
+        self.assertEqual(copy.mined, field.mined)
+
+    def test_large_seed(self):
+        field = random_field(3, 5, 3)
+        field.seed = 2 ** 64 - 1
+        self.assertEqual(Minefield.decode(field.encode()).seed, 2 ** 64 - 1)
+        field.seed = 2 ** 64
+        with self.assertRaises(ValueError):
+            field.encode()
+
+    def test_bad_data(self):
+        data = random_field(7, 9, 4).encode()
+        with self.assertRaises(ValueError):
+            Minefield.decode(data[:-1])
+        with self.assertRaises(ValueError):
+            Minefield.decode(b'XXXX' + data[4:])
+        with self.assertRaises(ValueError):
+            Minefield.decode(data[:BOARD_HEADER.size - 1])
+        with self.assertRaises(ValueError):
+            Minefield(9, 7, 0).restore(data)
+
+    def test_save_and_load(self):
+        field = Minefield(13, 11, 30)
+        field.place_mines((6, 5), seed=7)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "board.mswp")
+            field.save(path)
+            copy = Minefield.load(path)
+        self.assertEqual(copy.encode(), field.encode())
+
+
+if __name__ == "__main__":
+    unittest.main()
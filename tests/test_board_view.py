@@ -0,0 +1,36 @@
+import random
+import unittest
+from board_view import block_counts
+
+
+def counted_one_by_one(mask, width, height, block):
+    counts = [[0] * -(-width // block) for _ in range(-(-height // block))]
+    for x in range(width):
+        for y in range(height):
+            counts[y // block][x // block] += mask[x * height + y]
+    return counts
+
+
+class TestBlockCounts(unittest.TestCase):
+    """block_counts() against counting every Cell one by one."""
+
+    def check(self, width, height, block, density, seed=0):
+        rng = random.Random(seed)
+        mask = bytes(rng.random() < density for _ in range(width * height))
+        self.assertEqual(block_counts(mask, width, height, block), counted_one_by_one(mask, width, height, block))
+
+    def test_small_blocks(self):
+        for width, height, block in ((10, 10, 1), (10, 7, 3), (64, 40, 8), (33, 1, 5)):
+            with self.subTest(size=(width, height), block=block):
+                self.check(width, height, block, 0.5)
+
+    def test_blocks_wider_than_a_byte(self):
+        # A square of 500 x 10 full Cells counts far past 255.
+        for density in (0.5, 1.0):
+            with self.subTest(density=density):
+                self.check(2000, 10, 500, density)
+                self.check(600, 3, 256, density)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from engine import Engine, EMPHASIS_NAMES
+from game_settings import Setting
+
+
+class DisplayOnlySettings:
+    """Emphasis like the display panel's: checked, but with nothing to call."""
+
+    is_checked = True
+    pause_time = 100
+
+
+class TestBlockingCalls(unittest.TestCase):
+    """The blocking Engine methods run straight through, whatever the emphasis settings."""
+
+    def test_display_emphasis(self):
+        emphasis = {name: DisplayOnlySettings() for name in EMPHASIS_NAMES}
+        engine = Engine(30, 16, 15, emphasis=emphasis, seed=3)
+        engine.left_click((15, 8))
+        self.assertFalse(engine.is_new)
+        self.assertLess(engine.safes_left, 30 * 16 - engine.field.total_mines)
+        engine.run()
+
+
+class TraceEvents:
+    """Stands in for a TraceRecorder, keeping every event recorded."""
+
+    def __init__(self):
+        self.events = []
+
+    def record(self, *event):
+        self.events.append(event)
+
+    def record_board(self, board):
+        pass
+
+
+class TestUncover(unittest.TestCase):
+
+    def test_flagged_cell_left_in_clear_queue(self):
+        # The player flags a safe Cell the solver has already queued to clear.
+        engine = Engine(30, 16, 15, auto_solving=Setting(False), seed=3)
+        engine.left_click((15, 8))
+        field = engine.field
+        loc = next(loc for loc in field if not field[loc].is_naked and not field[loc].is_mined)
+        engine.clear_queue.append(loc)
+        engine.toggle_flag(loc, auto_flag=False)
+
+        engine.trace = TraceEvents()
+        safes_left, uncovers = engine.safes_left, engine.stats.uncovers
+        engine.uncover(loc)
+        self.assertTrue(field[loc].is_flagged)
+        self.assertFalse(field[loc].is_naked)
+        self.assertNotIn(loc, engine.clear_queue)
+        self.assertEqual(engine.safes_left, safes_left)
+        self.assertEqual(engine.stats.uncovers, uncovers)
+        self.assertEqual(engine.trace.events, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
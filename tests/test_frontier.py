@@ -0,0 +1,97 @@
+import random
+import unittest
+from itertools import product
+from boards import mid_game
+from frontier import Component, Frontier
+
+
+def brute_force(component):
+    """Every layout of `component`, by trying all of them. Returns `(safe, mined, counts)`."""
+    num_vars = len(component.variables)
+    layouts = [layout for layout in product((0, 1), repeat=num_vars)
+               if all(sum(layout[v] for v in members) == required
+                      for required, members in component.constraints)]
+    safe = {v for v in range(num_vars) if layouts and not any(layout[v] for layout in layouts)}
+    mined = {v for v in range(num_vars) if layouts and all(layout[v] for layout in layouts)}
+    counts = {}
+    for layout in layouts:
+        counts[sum(layout)] = counts.get(sum(layout), 0) + 1
+    return safe, mined, counts
+
+
+def random_component(rng, num_vars, num_constraints):
+    """Random constraints over `num_vars` variables, all met by one hidden layout."""
+    hidden = [rng.random() < 0.4 for _ in range(num_vars)]
+    constraints = []
+    for _ in range(num_constraints):
+        members = rng.sample(range(num_vars), rng.randint(1, min(8, num_vars)))
+        constraints.append((sum(hidden[v] for v in members), members))
+    return Component(list(range(100, 100 + num_vars)), constraints)
+
+
+class TestComponent(unittest.TestCase):
+    """Component.solve() and Component.counts() against enumerating every layout."""
+
+    def assertCountsEqual(self, counts, expected):
+        """Counts are relative, so compare them scaled to the same peak."""
+        self.assertEqual(set(counts), set(expected))
+        if not expected:
+            return
+        peak, expected_peak = max(counts.values()), max(expected.values())
+        for mines in expected:
+            self.assertAlmostEqual(counts[mines] / peak, expected[mines] / expected_peak)
+
+    def check(self, component):
+        safe, mined, counts = brute_force(component)
+        self.assertEqual(component.solve(), (safe, mined))
+        self.assertCountsEqual(component.counts(), counts)
+
+    def test_random_components(self):
+        rng = random.Random(0)
+        for case in range(300):
+            with self.subTest(case=case):
+                self.check(random_component(rng, rng.randint(1, 12), rng.randint(1, 10)))
+
+    def test_frontiers_of_real_boards(self):
+        checked = 0
+        for seed in range(60):
+            field = mid_game(8, 7, 12, seed)
+            for component in Frontier(field).components:
+                if len(component) <= 16:
+                    with self.subTest(seed=seed, variables=component.variables):
+                        self.check(component)
+                        checked += 1
+        self.assertGreater(checked, 50)
+
+    def test_no_layout(self):
+        # Two constraints on the same single variable which can't both hold.
+        component = Component([7], [(1, [0]), (0, [0])])
+        self.assertEqual(component.solve(), (set(), set()))
+        self.assertEqual(component.counts(), {})
+
+    def test_solve_is_cached(self):
+        component = Component([1, 2], [(1, [0, 1])])
+        self.assertIs(component.solve(), component.solve())
+
+
+class TestFrontier(unittest.TestCase):
+
+    def test_solve_returns_coordinates(self):
+        for seed in range(30):
+            field = mid_game(8, 7, 12, seed)
+            to_clear, to_flag = Frontier(field).solve()
+            with self.subTest(seed=seed):
+                self.assertFalse(any(field[loc].is_mined for loc in to_clear))
+                self.assertTrue(all(field[loc].is_mined for loc in to_flag))
+
+    def test_cache_reuses_unchanged_components(self):
+        field = mid_game(8, 7, 12, 3)
+        first = Frontier(field)
+        cache = {component.signature: component for component in first.components}
+        second = Frontier(field, cache=cache)
+        for old, new in zip(first.components, second.components):
+            self.assertIs(old, new)
+
+
+if __name__ == "__main__":
+    unittest.main()
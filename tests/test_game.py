@@ -0,0 +1,33 @@
+import unittest
+from game import Game
+from game_settings import LABEL_BOARD_LIMIT, CELL_SIZE, VIEWPORT_SIZE
+
+
+class TestPickRenderer(unittest.TestCase):
+    """Game.pick_renderer() picks each of the three boards by size."""
+
+    def test_small_boards_use_labels(self):
+        for width, height in ((9, 9), (16, 16), (30, 16), (1, LABEL_BOARD_LIMIT // CELL_SIZE)):
+            with self.subTest(size=(width, height)):
+                self.assertEqual(Game.pick_renderer(width, height), "labels")
+
+    def test_boards_that_fit_use_the_canvas(self):
+        largest = (VIEWPORT_SIZE[0] // CELL_SIZE, VIEWPORT_SIZE[1] // CELL_SIZE)
+        for width, height in ((40, 24), (31, 16), largest):
+            with self.subTest(size=(width, height)):
+                self.assertEqual(Game.pick_renderer(width, height), "canvas")
+
+    def test_boards_too_big_for_the_screen_use_the_viewport(self):
+        columns, rows = VIEWPORT_SIZE[0] // CELL_SIZE, VIEWPORT_SIZE[1] // CELL_SIZE
+        for width, height in ((columns + 1, rows), (columns, rows + 1), (1000, 1000), (100000, 10)):
+            with self.subTest(size=(width, height)):
+                self.assertEqual(Game.pick_renderer(width, height), "viewport")
+
+    def test_canvas_is_reachable(self):
+        # The largest board on screen must be over the limit, or the Canvas is never picked.
+        columns, rows = VIEWPORT_SIZE[0] // CELL_SIZE, VIEWPORT_SIZE[1] // CELL_SIZE
+        self.assertGreater(columns * rows, LABEL_BOARD_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
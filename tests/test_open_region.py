@@ -0,0 +1,114 @@
+import random
+import unittest
+from boards import uncover
+from minefield import Minefield
+
+
+def rescan(field):
+    """Neighbor counts and naked safe Cells, counted from scratch."""
+    naked, flagged, mined = field.naked, field.flagged, field.mined
+    table = field.neighbor_table
+    unknown = bytearray(sum(1 for j in table[i] if not naked[j] and not flagged[j]) for i in range(len(field)))
+    flagged_neighbors = bytearray(sum(flagged[j] for j in table[i]) for i in range(len(field)))
+    naked_safe = sum(1 for i in range(len(field)) if naked[i] and not mined[i])
+    return unknown, flagged_neighbors, naked_safe
+
+
+def expected_opening(field, loc):
+    """Cells an opening at `loc` should uncover: every zero Cell reachable, and its neighbors."""
+    table = field.neighbor_table
+    start = field.index(loc)
+    if field.surrounding_mines[start]:
+        return set()
+    opened = set()
+    seen = {start}
+    to_visit = [start]
+    while to_visit:
+        i = to_visit.pop()
+        for j in table[i]:
+            if field.naked[j] or field.flagged[j] or j in opened:
+                continue
+            opened.add(j)
+            if not field.surrounding_mines[j] and j not in seen:
+                seen.add(j)
+                to_visit.append(j)
+    return opened
+
+
+class RecordingView:
+    """Field view which only notes the Cells redrawn."""
+
+    def __init__(self):
+        self.redrawn = set()
+
+    def redraw(self, loc):
+        self.redrawn.add(loc)
+
+
+class TestOpenRegion(unittest.TestCase):
+    """open_region() keeps the neighbor counters right, checked against a full rescan."""
+
+    def play(self, width, height, percent_mined, seed, moves=40):
+        """Uncover and flag at random, checking the counters after every move."""
+        rng = random.Random(seed)
+        field = Minefield(width, height, width * height * percent_mined // 100)
+        field.place_mines((width // 2, height // 2), seed=seed)
+        for move in range(moves):
+            unknown = [loc for loc in field if not field[loc].is_naked and not field[loc].is_flagged]
+            if not unknown:
+                break
+            loc = rng.choice(unknown)
+            if field[loc].is_mined:
+                field.flag(loc)
+            else:
+                field.uncover(loc)
+                expected = expected_opening(field, loc)
+                view = field.view = RecordingView()
+                opened = field.open_region(loc)
+                field.view = None
+                self.assertEqual(set(opened), expected)
+                self.assertEqual(len(opened), len(expected))
+                self.assertEqual(view.redrawn, {field.loc(i) for i in expected})
+
+            unknown_neighbors, flagged_neighbors, naked_safe = rescan(field)
+            self.assertEqual(field.num_unknown_neighbors, unknown_neighbors, "move {}".format(move))
+            self.assertEqual(field.num_flagged_neighbors, flagged_neighbors, "move {}".format(move))
+            self.assertEqual(field.num_naked_safe, naked_safe, "move {}".format(move))
+        return field
+
+    def test_small_openings(self):
+        # Openings much smaller than the board take the cell by cell path.
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.play(40, 30, 20, seed)
+
+    def test_large_openings(self):
+        # A sparse board opens up in a few large regions, updated by convolution.
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.play(30, 20, 5, seed)
+
+    def test_narrow_boards(self):
+        for width, height in ((1, 20), (20, 1), (2, 9)):
+            with self.subTest(size=(width, height)):
+                self.play(width, height, 10, 0)
+
+    def test_numbered_cell_opens_nothing(self):
+        field = Minefield(5, 5, 1)
+        field.set_mines([(0, 0)])
+        field.uncover((1, 1))
+        self.assertEqual(field.open_region((1, 1)), [])
+
+    def test_flags_are_left_alone(self):
+        field = Minefield(6, 6, 1)
+        field.set_mines([(5, 5)])
+        field.flag((0, 0))
+        uncover(field, (2, 2))
+        self.assertTrue(field[0, 0].is_flagged)
+        self.assertFalse(field[0, 0].is_naked)
+        self.assertEqual(field.num_naked_safe, 6 * 6 - 2)
+        self.assertEqual(field.num_unknown_neighbors, rescan(field)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
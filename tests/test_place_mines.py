@@ -0,0 +1,85 @@
+import random
+import unittest
+from minefield import Minefield
+
+
+def mines(field):
+    return {loc for loc in field if field[loc].is_mined}
+
+
+def clear_zone(field, loc):
+    """`loc` and every neighbor of it."""
+    return {loc} | {field.loc(i) for i in field.neighbor_table[field.index(loc)]}
+
+
+class TestPlaceMines(unittest.TestCase):
+    """The guarantees of Minefield.place_mines(): a clear first step, mined flags, and reproducible seeds."""
+
+    def test_first_step_is_clear(self):
+        for width, height in ((9, 9), (30, 16), (5, 3), (1, 12)):
+            field = Minefield(width, height, width * height // 4)
+            for first_step in ((0, 0), (width - 1, height - 1), (width // 2, height // 2), (0, height - 1)):
+                for seed in range(10):
+                    with self.subTest(size=(width, height), first_step=first_step, seed=seed):
+                        field.reset(width, height, width * height // 4)
+                        field.place_mines(first_step, seed=seed)
+                        self.assertFalse(mines(field) & clear_zone(field, first_step))
+                        self.assertEqual(len(mines(field)), field.total_mines)
+
+    def test_crowded_board_stays_clear(self):
+        # Every Cell but the first step and its neighbors is mined.
+        field = Minefield(9, 9, 81 - 9)
+        field.place_mines((4, 4), seed=1)
+        self.assertEqual(mines(field), set(field) - clear_zone(field, (4, 4)))
+
+    def test_flags_are_mined(self):
+        rng = random.Random(0)
+        for seed in range(20):
+            field = Minefield(16, 16, 40)
+            first_step = (8, 8)
+            away = [loc for loc in field if loc not in clear_zone(field, first_step)]
+            flags = rng.sample(away, rng.randint(1, 6))
+            for loc in flags:
+                field.flag(loc)
+            field.place_mines(first_step, seed=seed)
+            with self.subTest(seed=seed):
+                self.assertTrue(set(flags) <= mines(field))
+                self.assertEqual(len(mines(field)), field.total_mines)
+                self.assertFalse(mines(field) & clear_zone(field, first_step))
+
+    def test_same_seed_same_layout(self):
+        for seed in (0, 1, 12345, 2 ** 40):
+            layouts = set()
+            for _ in range(3):
+                field = Minefield(30, 16, 99)
+                field.place_mines((3, 4), seed=seed)
+                layouts.add(bytes(field.mined))
+            self.assertEqual(len(layouts), 1)
+
+    def test_different_seeds_differ(self):
+        layouts = set()
+        for seed in range(10):
+            field = Minefield(30, 16, 99)
+            field.place_mines((3, 4), seed=seed)
+            layouts.add(bytes(field.mined))
+        self.assertEqual(len(layouts), 10)
+
+    def test_drawn_seed_is_kept(self):
+        field = Minefield(30, 16, 99)
+        field.place_mines((10, 10))
+        self.assertIsNotNone(field.seed)
+        copy = Minefield(30, 16, 99)
+        copy.place_mines((10, 10), seed=field.seed)
+        self.assertEqual(copy.mined, field.mined)
+        self.assertEqual(copy.first_step, (10, 10))
+
+    def test_neighbor_counts(self):
+        field = Minefield(30, 16, 99)
+        field.place_mines((0, 0), seed=5)
+        for loc in field:
+            expected = sum(field.mined[i] for i in field.neighbor_table[field.index(loc)])
+            self.assertEqual(field[loc].surrounding_mines, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
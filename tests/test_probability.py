@@ -0,0 +1,76 @@
+import unittest
+from itertools import combinations
+from boards import mid_game, unknown, constraints
+from probability import Probabilities
+
+
+def brute_force(field, mines_left):
+    """
+    Probability of each unknown Cell being mined, over every placement of
+    `mines_left` mines among the unknown Cells that agrees with every number.
+
+    Returns: `dict` of probabilities by Minefield index, or None if nothing agrees.
+    """
+    cells = unknown(field)
+    table = field.neighbor_table
+    checks = [(set(table[i]), required) for i, required in constraints(field)]
+    mined_count = dict.fromkeys(cells, 0)
+    layouts = 0
+    for mines in combinations(cells, mines_left):
+        mines = set(mines)
+        if all(len(neighbors & mines) == required for neighbors, required in checks):
+            layouts += 1
+            for i in mines:
+                mined_count[i] += 1
+    if not layouts:
+        return None
+    return {i: count / layouts for i, count in mined_count.items()}
+
+
+class TestProbabilities(unittest.TestCase):
+    """Probabilities.calculate() against enumerating every placement of the mines left."""
+
+    def check(self, field, mines_left):
+        expected = brute_force(field, mines_left)
+        result = Probabilities(field).calculate(mines_left)
+        if expected is None:
+            self.assertIsNone(result)
+            return
+
+        odds, interior_odds, interior = result
+        frontier_cells = set(odds)
+        interior_cells = [i for i in expected if i not in frontier_cells]
+        self.assertEqual(interior, len(interior_cells))
+        for i, probability in odds.items():
+            self.assertAlmostEqual(probability, expected[i], msg="frontier cell {}".format(field.loc(i)))
+        for i in interior_cells:
+            self.assertAlmostEqual(interior_odds, expected[i], msg="interior cell {}".format(field.loc(i)))
+
+    def test_small_boards(self):
+        checked = 0
+        for seed in range(40):
+            field = mid_game(6, 5, 6, seed, uncovers=2)
+            if len(unknown(field)) > 20:
+                continue
+            mines_left = field.total_mines - field.flagged.count(1)
+            with self.subTest(seed=seed):
+                self.check(field, mines_left)
+                checked += 1
+        self.assertGreater(checked, 20)
+
+    def test_wrong_number_of_mines_left(self):
+        # Too many mines for the unknown Cells agrees with nothing.
+        field = mid_game(6, 5, 6, 1)
+        self.check(field, len(unknown(field)) + 1)
+
+    def test_safest_is_least_likely(self):
+        field = mid_game(6, 5, 6, 2)
+        mines_left = field.total_mines - field.flagged.count(1)
+        expected = brute_force(field, mines_left)
+        loc, probability = Probabilities(field).safest(mines_left)
+        self.assertAlmostEqual(probability, min(expected.values()))
+        self.assertAlmostEqual(expected[field.index(loc)], probability)
+
+
+if __name__ == "__main__":
+    unittest.main()
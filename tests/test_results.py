@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from engine import Engine
+from game_settings import Setting
+from minefield import Minefield
+from results import ResultsStore, COLUMNS, game_row
+
+
+def played(seed, direction="LIFO", width=16, height=12, percent_mined=15):
+    engine = Engine(width, height, percent_mined, direction=Setting(direction), seed=seed)
+    engine.left_click((width // 2, height // 2))
+    return engine
+
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = ResultsStore(":memory:", batch_size=3)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_schema(self):
+        columns = [row[1] for row in self.store.query("PRAGMA table_info(games)")]
+        self.assertEqual(columns, ["id"] + list(COLUMNS))
+        indexes = {row[0] for row in self.store.query("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({"games_direction", "games_size", "games_density", "games_outcome"} <= indexes)
+
+    def test_add(self):
+        engines = [played(seed) for seed in range(7)]
+        # More rows than batch_size, so they go in several transactions.
+        self.assertEqual(self.store.add(game_row(engine, elapsed=0.5) for engine in engines), 7)
+        rows = self.store.query("SELECT seed, cells_cleared, safes_left, win, time FROM games ORDER BY id")
+        self.assertEqual(rows, [(engine.seed, engine.field.num_naked_safe, engine.safes_left, engine.win, 0.5)
+                                for engine in engines])
+
+    def test_board_replays_exactly(self):
+        engine = played(4)
+        self.store.add([game_row(engine)])
+        board, = self.store.query("SELECT board FROM games")[0]
+        field = Minefield.decode(board)
+        self.assertEqual(field.first_step, engine.field.first_step)
+        self.assertEqual(field.mined, engine.field.mined)
+
+        replay = Engine(field.width, field.height, engine.percent_mined)
+        replay.restore(board)
+        replay.left_click(field.first_step)
+        self.assertEqual(replay.field.naked, engine.field.naked)
+        self.assertEqual(replay.safes_left, engine.safes_left)
+
+    def test_solve_rates(self):
+        engines = [played(seed, direction) for direction in ("LIFO", "north") for seed in range(6)]
+        engines.append(played(0, "LIFO", width=9, height=9))
+        self.store.add(game_row(engine) for engine in engines)
+
+        rates = self.store.solve_rates(width=16, height=12)
+        self.assertEqual([rate[:3] for rate in rates], [("LIFO", 1, 6), ("north", 1, 6)])
+        for direction, hyper, games, win_rate, loss_rate, cleared in rates:
+            group = [engine for engine in engines[:12] if engine.direction.get() == direction]
+            self.assertAlmostEqual(win_rate, sum(engine.win for engine in group) / games)
+            self.assertAlmostEqual(loss_rate, sum(engine.game_over for engine in group) / games)
+            self.assertAlmostEqual(cleared, sum(engine.field.num_naked_safe for engine in group) / games)
+
+        self.assertEqual(sum(rate[2] for rate in self.store.solve_rates()), 13)
+        with self.assertRaises(ValueError):
+            self.store.solve_rates(colour="red")
+
+    def test_file_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.db")
+            with ResultsStore(path) as store:
+                store.add([game_row(played(1))])
+            with ResultsStore(path) as store:
+                self.assertEqual(store.query("SELECT COUNT(*) FROM games"), [(1,)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import struct
+import tempfile
+import unittest
+from engine import Engine
+from game_settings import Setting
+from solver_trace import TraceRecorder, TracePlayer, UNCOVER
+
+
+# Layout of the file, as written by TraceRecorder: magic and version, then
+#  events of action, step, x, y, rule and queue.
+HEADER_SIZE = struct.calcsize('<4sB')
+EVENT_SIZE = struct.calcsize('<BIIIBB')
+RULE_AT, QUEUE_AT = 13, 14
+
+
+def recorded_game(path, width, height, percent_mined, seed, direction="LIFO"):
+    """Plays a seeded game from the middle of the board, tracing it to `path`. Returns the finished Engine."""
+    engine = Engine(width, height, percent_mined, direction=Setting(direction), guessing=Setting(True), seed=seed)
+    with TraceRecorder(path) as recorder:
+        engine.trace = recorder
+        engine.left_click((width // 2, height // 2))
+    engine.trace = None
+    return engine
+
+
+class TestTraceSteps(unittest.TestCase):
+    """Engine.trace_steps() plays a trace back to the same board, counters and outcome."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.trace")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def play_back(self):
+        player = TracePlayer(self.path)
+        field = player.new_field()
+        engine = Engine(field.width, field.height, 100 * field.total_mines / len(field))
+        engine.restore(player.board)
+        names = list(engine.trace_steps(player))
+        self.assertTrue(all(name in engine.emphasis for name in names))
+        return engine
+
+    def test_round_trip(self):
+        outcomes = set()
+        for seed in range(12):
+            with self.subTest(seed=seed):
+                played = recorded_game(self.path, 16, 12, 18, seed)
+                replayed = self.play_back()
+                self.assertEqual(replayed.field.naked, played.field.naked)
+                self.assertEqual(replayed.field.flagged, played.field.flagged)
+                self.assertEqual(replayed.safes_left, played.safes_left)
+                self.assertEqual(replayed.mines_left, played.mines_left)
+                self.assertEqual(replayed.status, played.status)
+                self.assertEqual(replayed.win, played.win)
+                self.assertEqual(replayed.game_over, played.game_over)
+                self.assertLessEqual(replayed.steps, played.steps)
+                outcomes.add((played.win, played.game_over))
+        # Both wins and losses were played back.
+        self.assertIn((True, False), outcomes)
+        self.assertIn((False, True), outcomes)
+
+
+class TestBadTraces(unittest.TestCase):
+    """Broken trace files raise ValueError, never anything else."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.trace")
+        recorded_game(self.path, 9, 9, 12, 1)
+        with open(self.path, 'rb') as file:
+            self.data = file.read()
+        self.player = TracePlayer(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load(self, data):
+        with open(self.path, 'wb') as file:
+            file.write(data)
+        return TracePlayer(self.path)
+
+    def test_empty_file(self):
+        with self.assertRaises(ValueError):
+            self.load(b'')
+
+    def test_cut_short_anywhere(self):
+        board_end = self.data.index(self.player.board) + len(self.player.board)
+        for length in range(len(self.data)):
+            with self.subTest(length=length):
+                at_boundary = length >= board_end and (length - board_end) % EVENT_SIZE == 0
+                if at_boundary or length == HEADER_SIZE:
+                    # A recording stopped between records is still a good trace.
+                    self.load(self.data[:length])
+                else:
+                    with self.assertRaises(ValueError):
+                        self.load(self.data[:length])
+
+    def test_unknown_codes(self):
+        last = len(self.data) - EVENT_SIZE
+        for position, code in ((0, 9), (RULE_AT, 9), (QUEUE_AT, 9)):
+            with self.subTest(position=position):
+                data = bytearray(self.data)
+                data[last + position] = code
+                with self.assertRaises(ValueError):
+                    self.load(bytes(data))
+
+    def test_good_codes(self):
+        data = bytearray(self.data)
+        data[len(self.data) - EVENT_SIZE] = UNCOVER
+        self.assertEqual(len(self.load(bytes(data)).events), len(self.player.events))
+
+
+if __name__ == "__main__":
+    unittest.main()
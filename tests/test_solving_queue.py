@@ -0,0 +1,101 @@
+import random
+import unittest
+from itertools import count
+from game_settings import Setting
+from minefield import Minefield
+from solving_queue import Queue, SuperQueue
+
+
+# Coordinate each cardinal direction sorts on.
+AXIS = {"north": 1, "south": 1, "east": 0, "west": 0}
+
+
+def random_operations(rng, count, size=8):
+    """Appends and peek-and-removes, in a random mix, so the queues grow and shrink."""
+    for _ in range(count):
+        if rng.random() < 0.6:
+            yield "append", (rng.randrange(size), rng.randrange(size))
+        else:
+            yield "pop", None
+
+
+class TestSuperQueueOrder(unittest.TestCase):
+    """SuperQueue.peek() against the sort-based Queue.re_orient() it replaced."""
+
+    def setUp(self):
+        self.field = Minefield(8, 8, 0)
+
+    def test_cardinal_directions_match_sorting(self):
+        for direction, axis in AXIS.items():
+            with self.subTest(direction=direction):
+                rng = random.Random(direction)
+                old = Queue(self.field, direction=direction)
+                new = SuperQueue(self.field, None, Setting(direction))
+                added = {}
+                order = count()
+                for operation, cell in random_operations(rng, 3000):
+                    if operation == "append":
+                        if cell not in new:
+                            added[cell] = next(order)
+                        old.append(cell)
+                        new.append(cell)
+                        continue
+                    if not new:
+                        continue
+                    expected = old.peek()
+                    actual = new.peek()
+                    self.assertIn(actual, old)
+                    # Same place along the axis as the sorted Queue...
+                    self.assertEqual(actual[axis], expected[axis])
+                    # ...and ties go to the latest addition.
+                    tied = [c for c in old if c[axis] == actual[axis]]
+                    self.assertEqual(actual, max(tied, key=added.get))
+                    old.remove(actual)
+                    new.remove(actual)
+                    del added[actual]
+                self.assertEqual(set(old), set(new))
+
+    def test_change_of_direction_rebuilds_the_index(self):
+        direction = Setting("east")
+        queue = SuperQueue(self.field, None, direction)
+        for cell in [(3, 1), (0, 5), (7, 2), (4, 7)]:
+            queue.append(cell)
+        self.assertEqual(queue.peek(), (0, 5))
+        direction.set("west")
+        self.assertEqual(queue.peek(), (7, 2))
+        direction.set("north")
+        self.assertEqual(queue.peek(), (4, 7))
+        direction.set("south")
+        self.assertEqual(queue.peek(), (3, 1))
+
+    def test_random_direction_picks_uniformly_from_the_queue(self):
+        queue = SuperQueue(self.field, None, Setting("random"), rng=random.Random(0))
+        cells = [(x, y) for x in range(4) for y in range(4)]
+        for cell in cells:
+            queue.append(cell)
+        picks = {cell: 0 for cell in cells}
+        for _ in range(16000):
+            cell = queue.peek()
+            self.assertIn(cell, queue)
+            picks[cell] += 1
+        # 1000 expected each. Shuffling and taking the last cell, as before, is just as uniform.
+        self.assertTrue(all(800 < count < 1200 for count in picks.values()), picks)
+
+    def test_random_direction_tracks_removals(self):
+        rng = random.Random(1)
+        queue = SuperQueue(self.field, None, Setting("random"), rng=random.Random(2))
+        reference = set()
+        for operation, cell in random_operations(rng, 3000):
+            if operation == "append":
+                queue.append(cell)
+                reference.add(cell)
+            elif reference:
+                cell = queue.peek()
+                self.assertIn(cell, reference)
+                queue.remove(cell)
+                reference.remove(cell)
+            self.assertEqual(set(queue), reference)
+
+
+if __name__ == "__main__":
+    unittest.main()